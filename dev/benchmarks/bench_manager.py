@@ -0,0 +1,90 @@
+"""
+Benchmarks of the LinkManager methods which do the work of loading,
+redrawing and computing invariants of a diagram.  See conftest.py.
+"""
+
+from plink.manager import LinkManager
+from plink.smooth import Smoother
+
+def rounds(size):
+    """
+    Fewer rounds for large diagrams, where each one is slow.
+    """
+    return max(3, min(100, 20000 // size))
+
+def bench_unpickle(benchmark, data, size):
+    benchmark.group = 'unpickle'
+    benchmark.extra_info['vertices'] = len(data[0])
+    benchmark.extra_info['crossings'] = len(data[2])
+    benchmark.pedantic(LinkManager.unpickle,
+                       setup=lambda: ((LinkManager(),) + data, {}),
+                       rounds=rounds(size))
+
+def bench_update_crosspoints(benchmark, manager):
+    benchmark.group = 'update_crosspoints'
+    benchmark(manager.update_crosspoints)
+
+# The components, invariants and polyline segments are cached, so the
+# caches are emptied
+# before each round in order to time the computation rather than a
+# lookup.
+
+def cold(manager):
+    """
+    Returns a setup function which discards the cached components,
+    invariants and polyline segments of the manager.
+    """
+    def setup():
+        manager.topology_changed()
+        manager.bump_revision()
+    return setup
+
+def bench_arrow_components(benchmark, manager, size):
+    benchmark.group = 'arrow_components'
+    benchmark.pedantic(manager.arrow_components, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_crossing_components(benchmark, manager, size):
+    benchmark.group = 'crossing_components'
+    benchmark.pedantic(manager.crossing_components, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_sorted_components(benchmark, manager, size):
+    benchmark.group = 'sorted_components'
+    benchmark.pedantic(manager.sorted_components, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_DT_code(benchmark, manager, size):
+    benchmark.group = 'DT_code'
+    benchmark.pedantic(manager.DT_code, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_PD_code(benchmark, manager, size):
+    benchmark.group = 'PD_code'
+    benchmark.pedantic(manager.PD_code, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_Gauss_code(benchmark, manager, size):
+    benchmark.group = 'Gauss_code'
+    benchmark.pedantic(manager.Gauss_code, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_SnapPea_projection_file(benchmark, manager, size):
+    benchmark.group = 'SnapPea_projection_file'
+    benchmark.pedantic(manager.SnapPea_projection_file, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_polylines(benchmark, manager, size):
+    benchmark.group = 'polylines'
+    benchmark.pedantic(manager.polylines, setup=cold(manager),
+                       rounds=rounds(size))
+
+def bench_smoother(benchmark, manager, size):
+    """
+    Builds the smooth curves from scratch, without a canvas.
+    """
+    benchmark.group = 'Smoother'
+    polylines = manager.polylines()
+    benchmark.pedantic(lambda smoother: smoother.set_polylines(polylines),
+                       setup=lambda: ((Smoother(None),), {}),
+                       rounds=rounds(size))
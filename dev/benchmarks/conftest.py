@@ -0,0 +1,55 @@
+"""
+Fixtures for the LinkManager benchmarks, which need pytest-benchmark.
+Run them from the top of the repository with
+
+    python -m pytest dev/benchmarks --benchmark-json=benchmarks.json
+
+or save the results with --benchmark-autosave and compare two commits
+with --benchmark-compare or "pytest-benchmark compare".  The diagrams
+are closures of random braids, made by plink.synthetic, and their
+sizes in crossings are taken from the environment variable
+PLINK_BENCHMARK_SIZES, which defaults to 10,100,1000,10000.  The
+numbers of vertices and crossings are saved as extra info with each
+result.
+"""
+
+import os, sys
+from functools import lru_cache
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir,
+                                os.pardir, 'src'))
+from plink.manager import LinkManager
+from plink.synthetic import random_braid
+
+sizes = [int(size) for size in os.environ.get(
+    'PLINK_BENCHMARK_SIZES', '10,100,1000,10000').split(',')]
+
+@lru_cache(maxsize=None)
+def diagram(size):
+    """
+    Returns the unpickle data of a diagram with size crossings.
+    """
+    strands = max(3, int(size**0.5))
+    return random_braid(strands, size, seed=size)
+
+@pytest.fixture(params=sizes, ids=lambda size: '%d' % size)
+def size(request):
+    return request.param
+
+@pytest.fixture
+def data(size):
+    return diagram(size)
+
+@pytest.fixture
+def manager(data, benchmark):
+    """
+    A freshly loaded LinkManager, since some of the methods being
+    timed leave marks on the crossings.
+    """
+    result = LinkManager()
+    result.unpickle(*data)
+    result.update_crosspoints()
+    benchmark.extra_info['vertices'] = len(result.Vertices)
+    benchmark.extra_info['crossings'] = len(result.Crossings)
+    return result
@@ -0,0 +1,49 @@
+"""
+Checks that "import plink" finishes within a time budget.  The check
+that it does not load the optional and GUI modules is in
+tests/test_imports.py.  Run this one with pytest, or as a script:
+
+    python dev/import_time_test.py [budget in milliseconds]
+
+Each measurement uses a fresh interpreter and python -X importtime, and
+the best of several runs is compared with the budget, which may also
+be set with the environment variable PLINK_IMPORT_BUDGET_MS.
+"""
+
+import os, sys, subprocess
+
+budget_ms = float(os.environ.get('PLINK_IMPORT_BUDGET_MS', 300.0))
+runs = 5
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+env = dict(os.environ)
+env['PYTHONPATH'] = os.pathsep.join(
+    [os.path.normpath(src)] + env.get('PYTHONPATH', '').split(os.pathsep))
+
+def run(*args):
+    return subprocess.run([sys.executable] + list(args), env=env,
+                          capture_output=True, text=True, check=True)
+
+def import_time_ms():
+    """
+    Returns the cumulative time, in milliseconds, of "import plink".
+    """
+    report = run('-X', 'importtime', '-c', 'import plink').stderr
+    for line in report.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'plink':
+            return int(fields[1]) / 1000.0
+    raise RuntimeError('No timing for plink in:\n' + report)
+
+def test_import_time():
+    best = min(import_time_ms() for n in range(runs))
+    assert best <= budget_ms, 'import plink took %.1f ms' % best
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        budget_ms = float(sys.argv[1])
+    best = min(import_time_ms() for n in range(runs))
+    print('import plink: %.1f ms (budget %.1f ms)' % (best, budget_ms))
+    if best > budget_ms:
+        sys.exit('FAIL: import plink took %.1f ms' % best)
+    print('OK')
@@ -15,13 +15,35 @@
 #   DMS0504975 and DMS0204142.
 
 from .version import version as __version__
-from . import gui
 from .manager import LinkManager
-from .viewer import LinkViewer
-from .editor import LinkDisplay, LinkEditor
-    
+
 __all__ = ['LinkManager', 'LinkViewer', 'LinkDisplay', 'LinkEditor']
 
+# The GUI classes pull in tkinter, so they are imported on first use.
+# This keeps "import plink" cheap for programs, such as the workers of
+# plink.batch, which only need a LinkManager.
+_lazy_attributes = {
+    'LinkViewer': 'viewer',
+    'LinkDisplay': 'editor',
+    'LinkEditor': 'editor',
+}
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        from importlib import import_module
+        module = import_module('.' + _lazy_attributes[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name == 'gui':
+        from . import gui
+        return gui
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
 if __name__ == '__main__':
+    from .editor import LinkEditor
     LE = LinkEditor()
     LE.window.mainloop()
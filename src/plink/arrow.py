@@ -18,7 +18,7 @@ line segment in a PL link diagram.
 """
 
 from math import sqrt
-from .gui import *
+from .intersect import crossing_parameters
 
 defaults = dict(abs_gap_size=9.0,
                 rel_gap_size=0.3,
@@ -29,8 +29,13 @@ defaults = dict(abs_gap_size=9.0,
 
 class Arrow:
     """
-    An arrow in a PL link diagram.
+    An arrow in a PL link diagram.  Unless other_params are given,
+    arrows share the class's default_params dict, so it should be
+    replaced rather than modified to change a single arrow.
     """
+    __slots__ = ('start', 'end', 'canvas', 'color', 'component', 'style',
+                 'lines', 'line_options', 'dots', 'cross_params', 'params',
+                 'dx', 'dy', 'length')
     epsilon = 8
     scale_set = False
     scale_factor = 1
@@ -54,11 +59,14 @@ class Arrow:
         self.color = color
         self.component = None
         self.style = 'normal'
+        # Canvas items are reused by draw, which records the options
+        # last given to each line so that unchanged ones can be skipped.
         self.lines = []
+        self.line_options = []
         self.dots = []
         self.cross_params = []
         if other_params is None:
-            other_params = Arrow.default_params.copy()
+            other_params = Arrow.default_params
         self.params = other_params
         if self.start is not self.end:
             self.start.out_arrow = self
@@ -97,6 +105,7 @@ class Arrow:
     def hide(self):
         for line in self.lines:
             self.canvas.delete(line)
+        self.lines, self.line_options = [], []
         self.style = 'hidden'
 
     @property
@@ -106,6 +115,7 @@ class Arrow:
     def freeze(self):
         for line in self.lines:
             self.canvas.itemconfig(line, fill='gray')
+        self.line_options = [None]*len(self.lines)
         self.style = 'frozen'
 
     @property
@@ -115,11 +125,12 @@ class Arrow:
     def make_faint(self):
         for line in self.lines:
             self.canvas.itemconfig(line, fill='gray', width=1)
+        self.line_options = [None]*len(self.lines)
         self.style = 'faint'
 
-    def expose(self, crossings=[]):
+    def expose(self, crossings=[], crossings_on=None):
         self.style = 'normal'
-        self.draw(crossings)
+        self.draw(crossings, crossings_on=crossings_on)
 
     def find_segments(self, crossings, include_overcrossings=False):
         """
@@ -136,15 +147,19 @@ class Arrow:
         segments = []
         self.vectorize()
         cross_params = [(0.0,False), (1.0,False)]
+        include_overcrossings = (include_overcrossings or
+                                 params['include_overcrossings'])
+        others, gaps = [], []
         for c in crossings:
             if c.under == self:
-                t = self ^ c.over
-                if t:
-                    cross_params.append((t, not c.is_virtual))
-            if c.over == self and (include_overcrossings or params['include_overcrossings']):
-                t = self ^ c.under
-                if t:
-                    cross_params.append((t, False))
+                others.append(c.over)
+                gaps.append(not c.is_virtual)
+            if c.over == self and include_overcrossings:
+                others.append(c.under)
+                gaps.append(False)
+        for t, has_gap in zip(crossing_parameters(self, others), gaps):
+            if t:
+                cross_params.append((t, has_gap))
         cross_params.sort()
         
         def r(t):
@@ -175,7 +190,16 @@ class Arrow:
             segments.append( (a + gap_a, b - gap_b) )
         return [r(a) + r(b) for a, b in segments]
 
-    def draw(self, crossings=[], recurse=True, skip_frozen=True):
+    def draw(self, crossings=[], recurse=True, skip_frozen=True,
+             crossings_on=None):
+        """
+        Draws the arrow, broken at the crossings where it goes under.
+        If recurse is True, the arrows which pass under this one are
+        redrawn too.  If crossings_on is given, it should return the
+        crossings which involve a given arrow, like the method of the
+        LinkManager, and then crossings need only contain those of
+        this arrow.
+        """
         if self.hidden or (self.frozen and skip_frozen):
             return
         if self.style == 'frozen':
@@ -188,33 +212,57 @@ class Arrow:
             color = self.color
             thickness = 3 * self.scale_factor
         segments = self.find_segments(crossings)
-        for line in self.lines:
-            self.canvas.delete(line)
-        for dot in self.dots:
-            self.canvas.delete(dot)
-        for x0, y0, x1, y1 in segments[:-1]:
-            self.lines.append(self.canvas.create_line(
-                    x0, y0, x1, y1,
-                    width=thickness, fill=color, tags='transformable'))
         x0, y0, x1, y1 = segments[-1]
         last_seg_len = sqrt((x1 - x0)**2 + (y1 - y0)**2)
         no_arrow_size = self.params['no_arrow_size']
-        arrow = Tk_.LAST if last_seg_len >= no_arrow_size else None
-        self.lines.append(self.canvas.create_line(
-                x0, y0, x1, y1, arrow=arrow,
-                arrowshape=self.params['arrow_shape'],
-                width=thickness, fill=color, tags='transformable'))
+        head = 'last' if last_seg_len >= no_arrow_size else 'none'
+        arrow_shape = self.params['arrow_shape']
+        # Move the existing lines into place, only creating or deleting
+        # lines when the number of segments has changed.
+        canvas, lines, line_options = self.canvas, self.lines, self.line_options
+        while len(lines) > len(segments):
+            canvas.delete(lines.pop())
+            line_options.pop()
+        last, created = len(segments) - 1, False
+        for n, segment in enumerate(segments):
+            options = (color, thickness, head if n == last else 'none',
+                       arrow_shape)
+            if n < len(lines):
+                canvas.coords(lines[n], *segment)
+                if line_options[n] != options:
+                    canvas.itemconfig(lines[n], fill=color, width=thickness,
+                                      arrow=options[2], arrowshape=arrow_shape)
+                    line_options[n] = options
+            else:
+                lines.append(canvas.create_line(
+                    *segment, arrow=options[2], arrowshape=arrow_shape,
+                    width=thickness, fill=color, tags='transformable'))
+                line_options.append(options)
+                created = True
         if recurse:
             under_arrows = [c.under for c in crossings if c.over == self]
             for arrow in under_arrows:
-                arrow.draw(crossings, recurse=False)
-        for c in crossings:
-            if self == c.under and c.is_virtual:
-                self.dots.append(self.canvas.create_oval(
-                        c.x-5, c.y-5, c.x+5, c.y+5,
+                if crossings_on is None:
+                    arrow.draw(crossings, recurse=False)
+                else:
+                    arrow.draw(crossings_on(arrow), recurse=False)
+        centers = [(c.x, c.y) for c in crossings
+                   if self == c.under and c.is_virtual]
+        dots = self.dots
+        while len(dots) > len(centers):
+            canvas.delete(dots.pop())
+        for n, (x, y) in enumerate(centers):
+            if n < len(dots):
+                canvas.coords(dots[n], x-5, y-5, x+5, y+5)
+            else:
+                dots.append(canvas.create_oval(
+                        x-5, y-5, x+5, y+5,
                         fill='black', outline='black',
                         tags=('dot', 'transformable')))
-        self.canvas.tag_raise('dot', Tk_.ALL)
+                created = True
+        # New items are drawn on top, so the dots must be raised again.
+        if created:
+            canvas.tag_raise('dot', 'all')
     
     def set_start(self, vertex, crossings=[]):
         self.start = vertex
@@ -232,6 +280,7 @@ class Arrow:
         self.color = color
         for line in self.lines:
             self.canvas.itemconfig(line, fill=color)
+        self.line_options = [None]*len(self.lines)
             
     def erase(self):
         """
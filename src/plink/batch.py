@@ -0,0 +1,130 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module provides a command line tool which computes invariants
+of a collection of SnapPea link projection files without opening any
+windows.  For example:
+
+    python -m plink.batch --codes DT,PD -o codes.jsonl links/
+
+Directories are searched recursively for .lnk files, and a path of -
+reads a list of file names from stdin, one per line.  The files are
+distributed over a pool of worker processes, and one JSON object is
+written per file, in input order, with the time spent on that file.
+"""
+
+import os, sys, json, time, argparse
+from functools import partial
+from multiprocessing import Pool
+from .manager import LinkManager
+
+invariants = {
+    'DT': LinkManager.DT_code,
+    'PD': LinkManager.PD_code,
+    'Gauss': LinkManager.Gauss_code,
+    'BB': LinkManager.BB_framing,
+}
+
+
+def lnk_files(paths):
+    """
+    Generates the names of the link projection files specified by a
+    list of paths.
+    """
+    for path in paths:
+        if path == '-':
+            for line in sys.stdin:
+                line = line.strip()
+                if line:
+                    yield line
+        elif os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.lnk'):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def process_file(file_name, codes=tuple(invariants)):
+    """
+    Loads one link projection file and returns a dict containing the
+    requested invariants, or an error message, along with the number
+    of seconds spent on the file.
+    """
+    start = time.perf_counter()
+    record = {'file': file_name}
+    try:
+        manager = LinkManager()
+        with open(file_name) as infile:
+            manager._from_stream(infile)
+        record['crossings'] = len(manager.Crossings)
+        for code in codes:
+            record[code] = invariants[code](manager)
+    except Exception as error:
+        record['error'] = '%s: %s' % (error.__class__.__name__, error)
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='plink-batch',
+        description='Compute invariants of SnapPea link projection files.')
+    parser.add_argument('paths', nargs='+', metavar='path',
+        help='a .lnk file, a directory to search, or - to read file '
+             'names from stdin')
+    parser.add_argument('-c', '--codes', default=','.join(invariants),
+        help='comma separated invariants to compute, from %s '
+             '(default: all)' % ', '.join(invariants))
+    parser.add_argument('-o', '--output', default='-',
+        help='JSON Lines output file (default: stdout)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='number of worker processes (default: one per core)')
+    parser.add_argument('--chunksize', type=int, default=16,
+        help='number of files sent to a worker at a time (default: 16)')
+    options = parser.parse_args(args)
+    codes = tuple(code for code in options.codes.split(',') if code)
+    for code in codes:
+        if code not in invariants:
+            parser.error('unknown invariant %s' % code)
+    worker = partial(process_file, codes=codes)
+    files = lnk_files(options.paths)
+    output = sys.stdout if options.output == '-' else open(options.output, 'w')
+    count = errors = 0
+    start = time.perf_counter()
+    pool = Pool(options.jobs) if options.jobs > 1 else None
+    try:
+        if pool:
+            records = pool.imap(worker, files, chunksize=options.chunksize)
+        else:
+            records = map(worker, files)
+        for record in records:
+            output.write(json.dumps(record) + '\n')
+            count += 1
+            errors += 'error' in record
+    finally:
+        if pool:
+            pool.terminate()
+        if output is not sys.stdout:
+            output.close()
+    sys.stderr.write('Processed %d files with %d errors in %.2f seconds.\n' % (
+        count, errors, time.perf_counter() - start))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
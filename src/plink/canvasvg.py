@@ -12,7 +12,8 @@
 __author__  = "Wojciech Muła <wojciech_mula@poczta.onet.pl>"
 
 __all__ = ["convert", "SVGdocument", "saveall", "PYTHON", "MODULE", "NONE",
-    "warnings", "configure", "SEGMENT_TO_LINE", "SEGMENT_TO_PATH"
+    "warnings", "configure", "SEGMENT_TO_LINE", "SEGMENT_TO_PATH",
+    "ConversionContext"
 ]
 
 import tkinter
@@ -65,7 +66,94 @@ def configure(*flags):
             )
 
 
-def convert(document, canvas, items=None, tounicode=None):
+supported_item_types = \
+    set(["line", "oval", "polygon", "rectangle", "text", "arc"])
+
+# the item options which convert looks at
+used_options = [
+    "state", "tags", "width", "activewidth", "disabledwidth",
+    "outline", "activeoutline", "disabledoutline",
+    "fill", "activefill", "disabledfill",
+    "dash", "activedash", "disableddash", "dashoffset",
+    "capstyle", "joinstyle", "smooth", "arrow", "arrowshape",
+    "style", "start", "extent", "font", "anchor", "text",
+]
+
+
+class ConversionContext(object):
+    """
+    Remembers what has been learned from Tk during a conversion: the
+    HTML form of each color, the actual parameters of each font and,
+    for each item type, which of the used options the type has.  The
+    types, coordinates and options of all the items are fetched with
+    two Tcl calls instead of several calls per item.
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.tk = canvas.tk
+        self.colors = {}
+        self.fonts = {}
+        self.schemas = {}
+
+    def color(self, color):
+        "memoized HTMLcolor"
+        try:
+            return self.colors[color]
+        except KeyError:
+            html = self.colors[color] = HTMLcolor(self.canvas, color)
+            return html
+
+    def font(self, font):
+        "memoized actual parameters and ascent of a font"
+        try:
+            return self.fonts[font]
+        except KeyError:
+            result = self.fonts[font] = (font_actual(self.tk, font),
+                font_metrics(self.tk, font, 'ascent'))
+            return result
+
+    def schema(self, item, itemtype):
+        "the used options which items of this type have"
+        try:
+            return self.schemas[itemtype]
+        except KeyError:
+            names = self.canvas.itemconfigure(item)
+            schema = self.schemas[itemtype] = \
+                [name for name in used_options if name in names]
+            return schema
+
+    def items(self, items):
+        """
+        Yield (item, itemtype, coords, options) for each item,
+        where options is a dict containing the used options.
+        """
+        tk, w = self.tk, self.canvas._w
+        items = [int(item) for item in items]
+        if not items:
+            return
+        types = tk.splitlist(tk.eval('list ' + ' '.join(
+            '[%s type %d]' % (w, item) for item in items)))
+        queries = []
+        for item, itemtype in zip(items, types):
+            if itemtype not in supported_item_types:
+                emit_warning("Items of type '%s' are not supported." % itemtype)
+                continue
+            schema = self.schema(item, itemtype)
+            queries.append((item, itemtype, schema))
+        if not queries:
+            return
+        script = ['list']
+        for item, itemtype, schema in queries:
+            script.append('[list [%s coords %d] %s]' % (w, item, ' '.join(
+                '[%s itemcget %d -%s]' % (w, item, name) for name in schema)))
+        results = tk.splitlist(tk.eval(' '.join(script)))
+        for (item, itemtype, schema), result in zip(queries, results):
+            values = tk.splitlist(result)
+            coords = [float(x) for x in tk.splitlist(values[0])]
+            yield item, itemtype, coords, dict(zip(schema, values[1:]))
+
+
+def convert(document, canvas, items=None, tounicode=None, context=None):
     """
     Convert 'items' stored in 'canvas' to SVG 'document'.
     If 'items' is None, then all items are converted.
@@ -74,6 +162,9 @@ def convert(document, canvas, items=None, tounicode=None):
     it's unicode representation. It should be used when
     national characters are used on canvas.
 
+    context is a ConversionContext, which may be shared by
+    several conversions from the same canvas.
+
     Return list of XML elements
     """
     tk = canvas.tk
@@ -82,8 +173,8 @@ def convert(document, canvas, items=None, tounicode=None):
     if items is None:    # default: all items
         items = canvas.find_all()
 
-    supported_item_types = \
-        set(["line", "oval", "polygon", "rectangle", "text", "arc"])
+    if context is None:
+        context = ConversionContext(canvas)
 
     if tounicode is None:
         try:
@@ -95,21 +186,8 @@ def convert(document, canvas, items=None, tounicode=None):
             tounicode  = lambda text: str(text).encode("utf-8")
 
     elements = []
-    for item in items:
-
-        # skip unsupported items
-        itemtype = canvas.type(item)
-        if itemtype not in supported_item_types:
-            emit_warning("Items of type '%s' are not supported." % itemtype)
-            continue
-
-        # get item coords
-        coords = canvas.coords(item)
-
-        # get item options;
-        # options is a dict: opt. name -> opt. actual value
-        tmp     = canvas.itemconfigure(item)
-        options = dict((v0, v4) for v0, v1, v2, v3, v4 in tmp.values())
+    # options is a dict: opt. name -> opt. actual value
+    for item, itemtype, coords, options in context.items(items):
 
         # get state of item
         state = options['state']
@@ -146,10 +224,10 @@ def convert(document, canvas, items=None, tounicode=None):
             options['disabledfill']     = ''
 
         style = {}
-        style["stroke"] = HTMLcolor(canvas, get("outline"))
+        style["stroke"] = context.color(get("outline"))
 
         if get("fill"):
-            style["fill"] = HTMLcolor(canvas, get("fill"))
+            style["fill"] = context.color(get("fill"))
         else:
             style["fill"] = "none"
 
@@ -175,11 +253,11 @@ def convert(document, canvas, items=None, tounicode=None):
 
 
         if width:
-            dash = canvas.itemcget(item, 'dash')
-            if state == DISABLED and canvas.itemcget(item, 'disableddash'):
-                dash = canvas.itemcget(item, 'disableddash')
-            elif state == ACTIVE and canvas.itemcget(item, 'activedash'):
-                dash = canvas.itemcget(item, 'activedash')
+            dash = options.get('dash', '')
+            if state == DISABLED and options.get('disableddash'):
+                dash = options['disableddash']
+            elif state == ACTIVE and options.get('activedash'):
+                dash = options['activedash']
 
             if dash != '':
                 try:
@@ -265,7 +343,8 @@ def convert(document, canvas, items=None, tounicode=None):
             x = coords[0]
 
             # set y at 'dominant-baseline'
-            y = ymin + font_metrics(tk, options['font'], 'ascent')
+            actual, ascent = context.font(options['font'])
+            y = ymin + ascent
 
             element = setattribs(
                 document.createElement('text'),
@@ -274,13 +353,11 @@ def convert(document, canvas, items=None, tounicode=None):
             elements.append(element)
 
             element.appendChild(document.createTextNode(
-                tounicode(canvas.itemcget(item, 'text'))
+                tounicode(options['text'])
             ))
 
             # 2. Setup style
-            actual = font_actual(tk, options['font'])
-
-            style['fill'] = HTMLcolor(canvas, get('fill'))
+            style['fill'] = context.color(get('fill'))
             style["text-anchor"] = text_anchor[options["anchor"]]
             style['font-family'] = actual['family']
 
@@ -339,22 +416,8 @@ def saveall(filename, canvas, items=None, margin=10, tounicode=None):
         else:
             x1, y1, x2, y2 = bbox
     else:
-        x1 = None
-        y1 = None
-        x2 = None
-        y2 = None
-        for item in items:
-            X1, Y1, X2, Y2 = canvas.bbox(item)
-            if x1 is None:
-                x1 = X1
-                y1 = Y1
-                x2 = X2
-                y2 = Y2
-            else:
-                x1 = min(x1, X1)
-                x2 = max(x2, X2)
-                y1 = min(y1, Y1)
-                y2 = max(y2, Y2)
+        # the bbox of several items is their union
+        x1, y1, x2, y2 = canvas.bbox(*items)
 
     x1 -= margin
     y1 -= margin
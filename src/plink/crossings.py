@@ -23,12 +23,14 @@ class Crossing:
     """
     A pair of crossing arrows in a PL link diagram.
     """
+    __slots__ = ('over', 'under', 'locked', '_KLP', 'hit1', 'hit2',
+                 'comp1', 'comp2', 'flipped', 'is_virtual', 'x', 'y', 'label')
 
     def __init__(self, over, under, is_virtual=False, label=None):
         self.over = over
         self.under = under
         self.locked = False
-        self.KLP = {}    # See the SnapPea file link_projection.h
+        self._KLP = None
         self.hit1 = None  # For computing DT codes
         self.hit2 = None
         self.comp1 = None
@@ -38,6 +40,20 @@ class Crossing:
         self.locate()
         self.label = label
 
+    @property
+    def KLP(self):
+        """
+        A dict describing the crossing as in the SnapPea file
+        link_projection.h, created when it is first needed.
+        """
+        if self._KLP is None:
+            self._KLP = {}
+        return self._KLP
+
+    @KLP.setter
+    def KLP(self, value):
+        self._KLP = value
+
     def __repr__(self):
         self.locate()
         if not self.is_virtual:
@@ -139,6 +155,7 @@ class ECrossing:
     A pair: (Crossing, Arrow), where the Arrow is involved in the Crossing.
     The ECrossings correspond 1-1 with edges of the link diagram.
     """
+    __slots__ = ('crossing', 'arrow', 'strand')
 
     def __init__(self, crossing, arrow):
         if arrow not in crossing:
@@ -24,9 +24,10 @@ from . import smooth
 from .vertex import Vertex
 from .arrow import Arrow
 from .crossings import Crossing, ECrossing
+from .intersect import crossing_parameters
 from .colors import Palette
 from .dialog import InfoDialog
-from .manager import LinkManager
+from .manager import LinkManager, ProjectionFileError
 from .viewer import LinkViewer
 from .version import version
 from .ipython_tools import IPythonTkRoot
@@ -114,6 +115,9 @@ class PLinkBase(LinkViewer):
         self.current_info = 0
         self.has_focus = True
         self.focus_after = None
+        # Parts of the display waiting to be redrawn
+        self.dirty = set()
+        self.redraw_after = None
         # Info window
         self.infotext.bind('<Control-Shift-C>',
                            lambda event : self.infotext.event_generate('<<Copy>>'))
@@ -245,6 +249,7 @@ class PLinkBase(LinkViewer):
         self.canvas.after(100, reset_bg)
 
     def done(self, event=None):
+        self.cancel_redraw()
         self.window.destroy()
 
     def reopen(self):
@@ -297,7 +302,8 @@ class PLinkBase(LinkViewer):
             for arrow in component:
                 arrow.color = color
                 arrow.end.color = color
-                arrow.draw(self.Crossings)
+                arrow.draw(self.crossings_on(arrow),
+                           crossings_on=self.crossings_on)
             if self.style_var.get() != 'smooth':
                 self.color_keys.append(
                     self.canvas.create_text(x, y,
@@ -340,9 +346,7 @@ class PLinkBase(LinkViewer):
         self.infotext_contents.set(string)
 
     def _shift(self, dx, dy):
-        for vertex in self.Vertices:
-            vertex.x += dx
-            vertex.y += dy
+        self.translate(dx, dy)
         self.canvas.move('transformable', dx, dy)
         for livearrow in (self.LiveArrow1, self.LiveArrow2):
             if livearrow:
@@ -360,8 +364,10 @@ class PLinkBase(LinkViewer):
             vertex.x = ulx + xfactor*(vertex.x - ulx)
             vertex.y = uly + yfactor*(vertex.y - uly)
         self.update_crosspoints()
+        self.rebuild_index()
         for arrow in self.Arrows:
-            arrow.draw(self.Crossings, skip_frozen=False)
+            arrow.draw(self.crossings_on(arrow), skip_frozen=False,
+                       crossings_on=self.crossings_on)
         for vertex in self.Vertices:
             vertex.draw(skip_frozen=False)
         self.update_smooth()
@@ -400,13 +406,53 @@ class PLinkBase(LinkViewer):
         except TypeError:
             pass
 
+    def schedule_redraw(self, *parts):
+        """
+        Marks parts of the display as out of date and arranges for them
+        to be redrawn together when Tk is next idle, so that a burst of
+        changes costs one redraw.  The parts are 'vertex' for the active
+        vertex, 'smooth' for the smooth curves and 'info' for the info
+        text and the DT and crossing labels.  The dirty arrows are
+        always redrawn.
+        """
+        self.dirty.update(parts)
+        if self.redraw_after is None:
+            self.redraw_after = self.window.after_idle(self._idle_redraw)
+
+    def _idle_redraw(self):
+        self.redraw_after = None
+        self.redraw_now()
+
+    def redraw_now(self):
+        """
+        Immediately redraws the parts of the display which have been
+        marked as out of date.
+        """
+        self.cancel_redraw()
+        dirty, self.dirty = self.dirty, set()
+        arrows, self.dirty_arrows = self.dirty_arrows, set()
+        for arrow in arrows:
+            arrow.draw(self.crossings_on(arrow), recurse=False)
+        if 'vertex' in dirty and self.ActiveVertex is not None:
+            self.ActiveVertex.draw()
+        if 'smooth' in dirty:
+            self.update_smooth()
+        if 'info' in dirty:
+            self.update_info()
+
+    def cancel_redraw(self):
+        if self.redraw_after is not None:
+            self.window.after_cancel(self.redraw_after)
+            self.redraw_after = None
+
     def update_smooth(self):
-        self.smoother.clear()
         mode = self.style_var.get()
         if mode == 'smooth':
             self.smoother.set_polylines(self.polylines())
         elif mode == 'both':
             self.smoother.set_polylines(self.polylines(), thickness=2)
+        else:
+            self.smoother.clear()
 
     # Override to hijack the update_info method
     def _check_update(self):
@@ -428,7 +474,10 @@ class PLinkBase(LinkViewer):
         if info_value == 1:
             self.DT_normal()
         elif info_value == 2:
-            self.DT_alpha()
+            try:
+                self.DT_alpha()
+            except ValueError as error:
+                tkMessageBox.showwarning('Error', str(error))
         elif info_value == 3:
             self.Gauss_info()
         elif info_value == 4:
@@ -459,26 +508,30 @@ class PLinkBase(LinkViewer):
         """
         Display the DT hit counters next to each crossing.  Crossings
         that need to be flipped for the planar embedding have an
-        asterisk.
+        asterisk.  The counters are memoized, so only the positions
+        of the labels are recomputed when the diagram is unchanged.
         """
-        for crossing in self.Crossings:
+        hits = self.DT_hits()
+        if hits is None:
+            return
+        for crossing, (hit1, hit2, flipped) in zip(self.Crossings, hits):
             crossing.locate()
             yshift = 0
             for arrow in crossing.over, crossing.under:
                 arrow.vectorize()
                 if abs(arrow.dy) < .3*abs(arrow.dx):
                     yshift = 8
-            flip = ' *' if crossing.flipped else ''
+            flip = ' *' if flipped else ''
             self.DTlabels.append(self.canvas.create_text(
                     (crossing.x - 10, crossing.y - yshift),
                     anchor=Tk_.E,
-                    text=str(crossing.hit1),
+                    text=str(hit1),
                     fill='black'
                     ))
             self.DTlabels.append(self.canvas.create_text(
                     (crossing.x + 10, crossing.y - yshift),
                     anchor=Tk_.W,
-                    text=str(crossing.hit2) + flip,
+                    text=str(hit2) + flip,
                     fill='black'
                     ))
 
@@ -503,11 +556,15 @@ class PLinkBase(LinkViewer):
         else:
             loadfile = askopenfile(parent=self.window)
         if loadfile:
-            contents = loadfile.read()
-            loadfile.close()
             self.clear()
             self.clear_text()
-            hot = self._from_string(contents)
+            try:
+                hot = self._from_stream(loadfile)
+            except ProjectionFileError as error:
+                tkMessageBox.showwarning('Bad file', str(error))
+                return
+            finally:
+                loadfile.close()
             # make sure the window has been rendered before doing anything
             self.window.update()
             if hot:
@@ -529,7 +586,7 @@ class PLinkBase(LinkViewer):
                 ("All files", "")],
             )
         if savefile:
-            savefile.write(self.SnapPea_projection_file())
+            self.write_SnapPea_projection_file(savefile)
             savefile.close()
 
     def save_image(self, file_type='eps', colormode='color'):
@@ -580,6 +637,8 @@ class LinkEditor(PLinkBase):
         self.flipcheck = None
         self.shift_down = False
         self.state = 'start_state'
+        # The latest pointer position which has not been handled yet.
+        self.pending_motion = None
         self.canvas.bind('<Button-1>', self.single_click)
         self.canvas.bind('<Double-Button-1>', self.double_click)
         self.canvas.bind('<Shift-Button-1>', self.shift_click)
@@ -661,16 +720,17 @@ class LinkEditor(PLinkBase):
                     x0,y0,x1,y1 = self.canvas.coords(self.LiveArrow1)
                     x0, y0 = self.ActiveVertex.point()
                     self.canvas.coords(self.LiveArrow1, x0, y0, x1, y1)
-                    self.Crossings = [c for c in self.Crossings
-                                      if last_arrow not in c]
-                    self.Vertices.remove(last_arrow.end)
-                    self.Arrows.remove(last_arrow)
+                    for crossing in self.crossings_on(last_arrow):
+                        self.remove_crossing(crossing)
+                    self.remove_vertex(last_arrow.end)
+                    self.remove_arrow(last_arrow)
                     last_arrow.end.erase()
                     last_arrow.erase()
                     for arrow in self.Arrows:
-                        arrow.draw(self.Crossings)
+                        arrow.draw(self.crossings_on(arrow),
+                                   crossings_on=self.crossings_on)
                 if not self.ActiveVertex.in_arrow:
-                    self.Vertices.remove(self.ActiveVertex)
+                    self.remove_vertex(self.ActiveVertex)
                     self.ActiveVertex.erase()
                     self.goto_start_state()
         elif key in (plus_keycode, equal_keycode):
@@ -719,6 +779,7 @@ class LinkEditor(PLinkBase):
             # closed while it does not have focus.
             if self.focus_after:
                 self.window.after_cancel(self.focus_after)
+            self.cancel_redraw()
             self.window.destroy()
 
     def make_alternating(self):
@@ -736,24 +797,19 @@ class LinkEditor(PLinkBase):
         need_flipping = set()
         for component in self.DT_code()[0]:
             need_flipping.update(c for c in component if c < 0)
-        for crossing in self.Crossings:
-            if crossing.hit2 in need_flipping or crossing.hit1 in need_flipping:
+        for crossing, (hit1, hit2, _) in zip(self.Crossings, self.DT_hits()):
+            if hit2 in need_flipping or hit1 in need_flipping:
                 crossing.reverse()
-
+                self.crossing_changed(crossing)
         self.clear_text()
-        self.update_info()
-        for arrow in self.Arrows:
-            arrow.draw(self.Crossings)
-        self.update_smooth()
+        self.schedule_redraw('smooth', 'info')
 
     def reflect(self):
         for crossing in self.Crossings:
             crossing.reverse()
+            self.crossing_changed(crossing)
         self.clear_text()
-        self.update_info()
-        for arrow in self.Arrows:
-            arrow.draw(self.Crossings)
-        self.update_smooth()
+        self.schedule_redraw('smooth', 'info')
 
     def clear(self):
         self.lock_var.set(False)
@@ -799,14 +855,12 @@ class LinkEditor(PLinkBase):
         y = self.canvas.canvasy(event.y)
         self.clear_text()
         start_vertex = Vertex(x, y, self.canvas, style='hidden')
-        if start_vertex in self.CrossPoints:
+        crossing = self.find_crossing(start_vertex)
+        if crossing:
             #print('shift-click in %s'%self.state)
-            crossing = self.Crossings[self.CrossPoints.index(start_vertex)]
-            self.update_info()
             crossing.is_virtual = not crossing.is_virtual
-            crossing.under.draw(self.Crossings)
-            crossing.over.draw(self.Crossings)
-            self.update_smooth()
+            self.crossing_changed(crossing)
+            self.schedule_redraw('smooth', 'info')
 
     def single_click(self, event):
         """
@@ -824,15 +878,16 @@ class LinkEditor(PLinkBase):
         self.clear_text()
         start_vertex = Vertex(x, y, self.canvas, style='hidden')
         if self.state == 'start_state':
-            if start_vertex in self.Vertices:
+            vertex = self.find_vertex(start_vertex)
+            crossing = self.find_crossing(start_vertex)
+            if vertex:
                 #print('single click on a vertex')
                 self.state = 'dragging_state'
                 self.hide_DT()
                 self.hide_labels()
                 self.update_info()
                 self.canvas.config(cursor=closed_hand_cursor)
-                self.ActiveVertex = self.Vertices[
-                    self.Vertices.index(start_vertex)]
+                self.ActiveVertex = vertex
                 self.ActiveVertex.freeze()
                 self.saved_crossing_data = self.active_crossing_data()
                 x1, y1 = self.ActiveVertex.point()
@@ -854,17 +909,14 @@ class LinkEditor(PLinkBase):
                 return
             elif self.lock_var.get():
                 return
-            elif start_vertex in self.CrossPoints:
+            elif crossing:
                 #print('single click on a crossing')
-                crossing = self.Crossings[self.CrossPoints.index(start_vertex)]
                 if crossing.is_virtual:
                     crossing.is_virtual = False
                 else:
                     crossing.reverse()
-                self.update_info()
-                crossing.under.draw(self.Crossings)
-                crossing.over.draw(self.Crossings)
-                self.update_smooth()
+                self.crossing_changed(crossing)
+                self.schedule_redraw('smooth', 'info')
                 return
             elif self.clicked_on_arrow(start_vertex):
                 #print('clicked on an arrow.')
@@ -877,7 +929,7 @@ class LinkEditor(PLinkBase):
                     return
             x1, y1 = start_vertex.point()
             start_vertex.set_color(self.palette.new())
-            self.Vertices.append(start_vertex)
+            self.add_vertex(start_vertex)
             self.ActiveVertex = start_vertex
             self.goto_drawing_state(x1,y1)
             return
@@ -903,15 +955,17 @@ class LinkEditor(PLinkBase):
                 next_arrow = Arrow(self.ActiveVertex, next_vertex,
                                  self.canvas, style='hidden',
                                  color=this_color)
-                self.Arrows.append(next_arrow)
+                self.add_arrow(next_arrow)
+            self.topology_changed()
             next_vertex.set_color(next_arrow.color)
-            if next_vertex in [v for v in self.Vertices if v.is_endpoint()]:
+            endpoint = self.find_vertex(next_vertex, endpoints_only=True)
+            if endpoint:
                 #print('melding vertices')
                 if not self.generic_arrow(next_arrow):
                     self.alert()
                     return
                 next_vertex.erase()
-                next_vertex = self.Vertices[self.Vertices.index(next_vertex)]
+                next_vertex = endpoint
                 if next_vertex.in_arrow:
                     next_vertex.reverse_path()
                 next_arrow.set_end(next_vertex)
@@ -919,8 +973,10 @@ class LinkEditor(PLinkBase):
                 if next_vertex.color != self.ActiveVertex.color:
                     self.palette.recycle(self.ActiveVertex.color)
                     next_vertex.recolor_incoming(color = next_vertex.color)
+                self.topology_changed()
                 self.update_crossings(next_arrow)
-                next_arrow.expose(self.Crossings)
+                next_arrow.expose(self.crossings_on(next_arrow),
+                              crossings_on=self.crossings_on)
                 self.goto_start_state()
                 return
             #print('just extending a path, as usual')
@@ -931,8 +987,9 @@ class LinkEditor(PLinkBase):
                 return
             self.update_crossings(next_arrow)
             self.update_crosspoints()
-            next_arrow.expose(self.Crossings)
-            self.Vertices.append(next_vertex)
+            next_arrow.expose(self.crossings_on(next_arrow),
+                          crossings_on=self.crossings_on)
+            self.add_vertex(next_vertex)
             next_vertex.expose()
             self.ActiveVertex = next_vertex
             self.canvas.coords(self.LiveArrow1,x,y,x,y)
@@ -963,23 +1020,25 @@ class LinkEditor(PLinkBase):
                 self.alert()
                 return
             # The first click on a vertex put us in dragging state.
-            if vertex in [v for v in self.Vertices if v.is_endpoint()]:
+            endpoint = self.find_vertex(vertex, endpoints_only=True)
+            cut_vertex = self.find_vertex(vertex)
+            if endpoint:
                 #print('double-clicked on an endpoint')
                 vertex.erase()
-                vertex = self.Vertices[self.Vertices.index(vertex)]
+                vertex = endpoint
                 x0, y0 = x1, y1 = vertex.point()
                 if vertex.out_arrow:
                     self.update_crosspoints()
                     vertex.reverse_path()
-            elif vertex in self.Vertices:
+            elif cut_vertex:
                 #print('double-clicked on a non-endpoint vertex')
-                cut_vertex = self.Vertices[self.Vertices.index(vertex)]
                 cut_vertex.recolor_incoming(palette=self.palette)
                 cut_arrow = cut_vertex.in_arrow
                 cut_vertex.in_arrow = None
                 vertex = cut_arrow.start
                 x1, y1 = cut_vertex.point()
                 cut_arrow.freeze()
+            self.topology_changed()
             self.ActiveVertex = vertex
             self.goto_drawing_state(x1,y1)
             return
@@ -993,21 +1052,21 @@ class LinkEditor(PLinkBase):
     def set_start_cursor(self, x, y):
         point = Vertex(x, y, self.canvas, style='hidden')
         if self.shift_down:
-            if point in self.CrossPoints:
+            if self.find_crossing(point):
                 self.canvas.config(cursor='dot')
             else:
                 self.canvas.config(cursor='')
         elif self.lock_var.get():
-            if point in self.Vertices:
+            if self.find_vertex(point):
                 self.flipcheck = None
                 self.canvas.config(cursor=open_hand_cursor)
             else:
                 self.canvas.config(cursor='')
         else:
-            if point in self.Vertices:
+            if self.find_vertex(point):
                 self.flipcheck = None
                 self.canvas.config(cursor=open_hand_cursor)
-            elif point in self.CrossPoints:
+            elif self.find_crossing(point):
                 self.flipcheck = None
                 self.canvas.config(cursor='exchange')
             elif self.cursor_on_arrow(point):
@@ -1040,8 +1099,22 @@ class LinkEditor(PLinkBase):
                 self.window.event_generate('<Return>')
                 return 'break'
             else:
-                self.move_active(self.canvas.canvasx(event.x),
-                                 self.canvas.canvasy(event.y))
+                # Only the latest position is used when the vertex is
+                # moved, so motion events which arrive faster than the
+                # display can be redrawn are dropped.
+                self.pending_motion = (x, y)
+                self.schedule_redraw()
+
+    def redraw_now(self):
+        """
+        Moves the active vertex to the latest pointer position, if it
+        has not been handled yet, and redraws the out of date parts of
+        the display.
+        """
+        motion, self.pending_motion = self.pending_motion, None
+        if motion and self.state == 'dragging_state':
+            self.move_active(*motion)
+        PLinkBase.redraw_now(self)
 
     def active_crossing_data(self):
         """
@@ -1065,6 +1138,7 @@ class LinkEditor(PLinkBase):
             if self.move_is_ok():
                 if not self.generic_vertex(active):
                     active.x, active.y = x0, y0
+                    self.vertex_moved(active)
                     if self.cursor_attached:
                         self.detach_cursor('non-generic active vertex')
                     self.canvas.delete('lock_error')
@@ -1075,6 +1149,7 @@ class LinkEditor(PLinkBase):
                     return
                 if not self.verify_drag():
                     active.x, active.y = x0, y0
+                    self.vertex_moved(active)
                     if self.cursor_attached:
                         self.detach_cursor('non-generic diagram')
                     return
@@ -1087,21 +1162,20 @@ class LinkEditor(PLinkBase):
                 if self.cursor_attached:
                     self.detach_cursor('bad move')
                 active.x, active.y = x0, y0
-                self.ActiveVertex.draw()
+                self.vertex_moved(active)
+                self.schedule_redraw('vertex')
                 return
             self.canvas.delete('lock_error')
         else:
             active.x, active.y = float(x), float(y)
-        self.ActiveVertex.draw()
+            self.vertex_moved(active)
         if self.LiveArrow1:
             x0,y0,x1,y1 = self.canvas.coords(self.LiveArrow1)
             self.canvas.coords(self.LiveArrow1, x0, y0, x, y)
         if self.LiveArrow2:
             x0,y0,x1,y1 = self.canvas.coords(self.LiveArrow2)
             self.canvas.coords(self.LiveArrow2, x0, y0, x, y)
-        self.update_smooth()
-        self.update_info()
-        self.window.update_idletasks()
+        self.schedule_redraw('vertex', 'smooth', 'info')
 
     def attach_cursor(self, reason=''):
         #print('attaching:', reason)
@@ -1134,9 +1208,10 @@ class LinkEditor(PLinkBase):
             self.shift_stamp = now
 
     def clicked_on_arrow(self, vertex):
-        for arrow in self.Arrows:
+        for arrow in self.arrows_near(vertex, Arrow.epsilon):
             if arrow.too_close(vertex):
                 arrow.end.reverse_path(self.Crossings)
+                self.topology_changed()
                 self.update_info()
                 return True
         return False
@@ -1144,7 +1219,7 @@ class LinkEditor(PLinkBase):
     def cursor_on_arrow(self, point):
         if self.lock_var.get():
             return False
-        for arrow in self.Arrows:
+        for arrow in self.arrows_near(point, Arrow.epsilon):
             if arrow.too_close(point):
                 return True
         return False
@@ -1156,7 +1231,7 @@ class LinkEditor(PLinkBase):
         self.canvas.delete(self.LiveArrow2)
         self.LiveArrow2 = None
         self.ActiveVertex = None
-        self.update_crosspoints()
+        self.relocate_crossings()
         self.state = 'start_state'
         self.set_style()
         self.update_info()
@@ -1175,14 +1250,15 @@ class LinkEditor(PLinkBase):
 
     def verify_drag(self):
         active = self.ActiveVertex
-        active.update_arrows()
+        self.vertex_moved(active)
         self.update_crossings(active.in_arrow)
         self.update_crossings(active.out_arrow)
-        self.update_crosspoints()
         return (self.generic_arrow(active.in_arrow) and
                 self.generic_arrow(active.out_arrow) )
 
     def end_dragging_state(self):
+        # Catch up with the pointer before the vertex is placed.
+        self.redraw_now()
         if not self.verify_drag():
             raise ValueError
         if self.lock_var.get():
@@ -1191,14 +1267,15 @@ class LinkEditor(PLinkBase):
         else:
             x, y = float(self.cursorx), float(self.cursory)
             self.ActiveVertex.x, self.ActiveVertex.y = x, y
+            self.vertex_moved(self.ActiveVertex)
         endpoint = None
         if self.ActiveVertex.is_endpoint():
-            other_ends = [v for v in self.Vertices if
-                          v.is_endpoint() and v is not self.ActiveVertex]
-            if self.ActiveVertex in other_ends:
-                endpoint = other_ends[other_ends.index(self.ActiveVertex)]
+            endpoint = self.find_vertex(self.ActiveVertex,
+                                        exclude=self.ActiveVertex,
+                                        endpoints_only=True)
+            if endpoint:
                 self.ActiveVertex.swallow(endpoint, self.palette)
-                self.Vertices = [v for v in self.Vertices if v is not endpoint]
+                self.remove_vertex(endpoint)
             self.update_crossings(self.ActiveVertex.in_arrow)
             self.update_crossings(self.ActiveVertex.out_arrow)
         if endpoint is None and not self.generic_vertex(self.ActiveVertex):
@@ -1212,9 +1289,9 @@ class LinkEditor(PLinkBase):
         self.goto_start_state()
 
     def generic_vertex(self, vertex):
-        if vertex in [v for v in self.Vertices if v is not vertex]:
+        if self.find_vertex(vertex, exclude=vertex):
             return False
-        for arrow in self.Arrows:
+        for arrow in self.arrows_near(vertex, Arrow.epsilon + 2):
             if arrow.too_close(vertex, tolerance=Arrow.epsilon + 2):
                 #print('non-generic vertex')
                 return False
@@ -1224,7 +1301,7 @@ class LinkEditor(PLinkBase):
         if arrow == None:
             return True
         locked = self.lock_var.get()
-        for vertex in self.Vertices:
+        for vertex in self.vertices_near(arrow, 2*Arrow.epsilon):
             if arrow.too_close(vertex):
                 if locked:
                     x, y, delta = vertex.x, vertex.y, 6
@@ -1234,8 +1311,8 @@ class LinkEditor(PLinkBase):
                                             tags='lock_error')
                 #print('arrow too close to vertex %s'%vertex)
                 return False
-        for crossing in self.Crossings:
-            point = self.CrossPoints[self.Crossings.index(crossing)]
+        for crossing in self.crossings_near(arrow, 2*Arrow.epsilon):
+            point = Vertex(crossing.x, crossing.y, self.canvas, style='hidden')
             if arrow not in crossing and arrow.too_close(point):
                 if locked:
                     x, y, delta = point.x, point.y, 6
@@ -1248,44 +1325,56 @@ class LinkEditor(PLinkBase):
         return True
 
     def destroy_arrow(self, arrow):
-        self.Arrows.remove(arrow)
+        # The crossings must be removed while the arrow still has them.
+        for crossing in self.crossings_on(arrow):
+            self.remove_crossing(crossing)
+        self.remove_arrow(arrow)
         if arrow.end:
             arrow.end.in_arrow = None
         if arrow.start:
             arrow.start.out_arrow = None
+        self.topology_changed()
         arrow.erase()
-        self.Crossings = [c for c in self.Crossings if arrow not in c]
 
     def update_crossings(self, this_arrow):
         """
-        Redraw any arrows which were changed by moving this_arrow.
+        Update the crossings of this_arrow, which has moved, and redraw
+        any arrows which were changed by moving it.  Only the arrows
+        near this_arrow are examined, and only the crossings involving
+        this_arrow are relocated.
         """
         if this_arrow == None:
             return
-        cross_list = [c for c in self.Crossings if this_arrow in c]
+        self.file_arrow(this_arrow)
+        # Map the other arrow of each crossing on this_arrow to the crossing.
+        cross_dict = {}
+        for crossing in self.crossings_on(this_arrow):
+            other = crossing.over if crossing.under == this_arrow else crossing.under
+            cross_dict[other] = crossing
         damage_list =[]
-        find = lambda x: cross_list[cross_list.index(x)]
-        for arrow in self.Arrows:
-            if this_arrow == arrow:
+        nearby = [arrow for arrow in self.arrows_near(this_arrow)
+                  if arrow != this_arrow]
+        for arrow, t in zip(nearby, crossing_parameters(this_arrow, nearby)):
+            if t is None:
                 continue
-            new_crossing = Crossing(this_arrow, arrow)
-            new_crossing.locate()
-            if new_crossing.x != None:
-                if new_crossing in cross_list:
-                    #print('keeping %s'%new_crossing)
-                    find(new_crossing).locate()
-                    continue
-                else:
-                    #print('adding %s'%new_crossing)
-                    self.Crossings.append(new_crossing)
+            if arrow in cross_dict:
+                crossing = cross_dict.pop(arrow)
+                #print('keeping %s'%crossing)
+                crossing.locate()
+                self.file_crossing(crossing)
             else:
-                #print('removing %s'%new_crossing)
-                if new_crossing in self.Crossings:
-                    if arrow == find(new_crossing).under:
-                        damage_list.append(arrow)
-                    self.Crossings.remove(new_crossing)
+                crossing = Crossing(this_arrow, arrow)
+                #print('adding %s'%crossing)
+                self.add_crossing(crossing)
+        # The remaining crossings are gone.
+        for arrow, crossing in cross_dict.items():
+            #print('removing %s'%crossing)
+            if arrow == crossing.under:
+                damage_list.append(arrow)
+            self.remove_crossing(crossing)
         for arrow in damage_list:
-            arrow.draw(self.Crossings)
+            arrow.draw(self.crossings_on(arrow),
+                       crossings_on=self.crossings_on)
 
     def crossed_arrows(self, arrow, ignore_list=[]):
         """
@@ -1295,11 +1384,10 @@ class LinkEditor(PLinkBase):
         if arrow is None:
             return tuple()
         arrow.vectorize()
-        crosslist = []
-        for n, diagram_arrow in enumerate(self.Arrows):
-            if arrow == diagram_arrow or diagram_arrow in ignore_list:
-                continue
-            t = arrow ^ diagram_arrow
-            if t is not None:
-                crosslist.append((t, n))
-        return tuple(n for _, n in sorted(crosslist))
+        nearby = [diagram_arrow for diagram_arrow in self.arrows_near(arrow)
+                  if diagram_arrow != arrow and diagram_arrow not in ignore_list]
+        crosslist = [(t, diagram_arrow) for diagram_arrow, t in
+                     zip(nearby, crossing_parameters(arrow, nearby))
+                     if t is not None]
+        crosslist.sort(key=lambda x: x[0])
+        return tuple(diagram_arrow for _, diagram_arrow in crosslist)
@@ -24,7 +24,6 @@ try:
     import tkinter.filedialog as tkFileDialog
     import tkinter.messagebox as tkMessageBox
     import tkinter.ttk as ttk
-    from . import canvasvg
     from tkinter.simpledialog import Dialog as SimpleDialog
 except ImportError:
     # Tk is unavailable or misconfigured.
@@ -45,11 +44,9 @@ else:
     underscore_keycode = '_'
 
 from urllib.request import pathname2url
-try:
-    import pyx
-    have_pyx = True
-except ImportError:
-    have_pyx = False
+from importlib.util import find_spec
+# Only check for PyX here; it is imported by the first PDF export.
+have_pyx = find_spec('pyx') is not None
 
 if sys.platform == 'linux2' or sys.platform == 'linux':
     closed_hand_cursor = 'fleur'
@@ -0,0 +1,73 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module exports the function crossing_parameters, which computes
+Arrow.__xor__ for one arrow against a list of arrows.  When NumPy is
+available and the list is long enough to pay for building arrays, the
+computation is done with NumPy; otherwise each pair is handled by
+Arrow.__xor__.  Both paths carry out the same floating point
+operations, so they return identical results.  It also exports
+load_numpy, which is shared with the smooth module.
+"""
+
+# NumPy takes most of the time of "import plink", so it is only loaded
+# by the first computation large enough to use it; see load_numpy.
+numpy = None
+have_numpy = None
+
+# Below this many arrows the arrays cost more to build than they save.
+numpy_cutoff = 128
+
+def load_numpy():
+    """
+    Imports NumPy, if that has not been tried yet, and returns it, or
+    None if NumPy is not installed.
+    """
+    global numpy, have_numpy
+    if have_numpy is None:
+        try:
+            import numpy
+            have_numpy = True
+        except ImportError:
+            have_numpy = False
+    return numpy if have_numpy else None
+
+
+def crossing_parameters(arrow, others):
+    """
+    Returns a list containing arrow ^ other for each arrow in others:
+    the barycentric coordinate on arrow of its crossing with other, or
+    None if the two arrows do not cross.  All of the arrows must have
+    been vectorized.
+    """
+    if len(others) < numpy_cutoff or load_numpy() is None:
+        return [arrow ^ other for other in others]
+    # Building one array per coordinate is much faster than building
+    # a 2-dimensional array from a list of tuples.
+    starts = [other.start for other in others]
+    ox = numpy.array([v.x for v in starts], dtype=numpy.float64)
+    oy = numpy.array([v.y for v in starts], dtype=numpy.float64)
+    odx = numpy.array([other.dx for other in others], dtype=numpy.float64)
+    ody = numpy.array([other.dy for other in others], dtype=numpy.float64)
+    x, y = float(arrow.start.x), float(arrow.start.y)
+    dx, dy = arrow.dx, arrow.dy
+    D = odx*dy - dx*ody
+    xx = ox - x
+    yy = oy - y
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        s = (yy*dx - xx*dy)/D
+        t = (yy*odx - xx*ody)/D
+    crossing = (D != 0) & (0 < s) & (s < 1) & (0 < t) & (t < 1)
+    return [T if C else None for T, C in zip(t.tolist(), crossing.tolist())]
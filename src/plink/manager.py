@@ -20,16 +20,41 @@ diagrams as well as computing features of the diagram, such as the components
 of the link.
 """
 
-import time
+import io, time
+from copy import deepcopy
+from functools import wraps
 from string import ascii_lowercase
-from .gui import tkMessageBox
 from .vertex import Vertex
 from .arrow import Arrow
 from .crossings import Crossing, ECrossing
-from .smooth import TikZPicture
+from .smooth import PDFPicture, TikZPicture, SVGPicture, bounds
+from .sweep import find_crossings
+from .spatial import SpatialGrid
+from .store import DiagramStore
+from .projection_file import read_projection, ProjectionFileError
 DT_alphabet = '_abcdefghijklmnopqrstuvwxyzZYXWVUTSRQPONMLKJIHGFEDCBA'
 
 
+def memoized(method):
+    """
+    Decorates a LinkManager method which computes an invariant of the
+    diagram, so that its values are cached until the revision changes.
+    The cache holds its own copy of each value and callers are given
+    copies of it, so they may modify what they get.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._check_revision()
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            return deepcopy(self._invariants[key])
+        except KeyError:
+            value = method(self, *args, **kwargs)
+            self._invariants[key] = deepcopy(value)
+            return value
+    return wrapper
+
+
 class LinkManager:
     """
     Manages the data associated with a link projection.
@@ -41,7 +66,6 @@ class LinkManager:
         self.Arrows = []
         self.Vertices = []
         self.Crossings = []
-        self.CrossPoints = []
         self.LiveArrow1 = None
         self.LiveArrow2 = None
         self.ActiveVertex = None
@@ -51,98 +75,443 @@ class LinkManager:
         self.shift_delta = (0,0)
         self.shifting = False
         self.canvas = canvas
+        self.vertex_grid = SpatialGrid()
+        self.arrow_grid = SpatialGrid()
+        self.crossing_grid = SpatialGrid()
+        # Maps each arrow to a dict, used as an ordered set, of the
+        # crossings which involve it.
+        self.arrow_crossings = {}
+        # Caches the crossings of each arrow, sorted by height, and
+        # remembers the old order of those which may have changed.
+        self._crossings_along = {}
+        self._old_orders = {}
+        self._components = None
+        # Incremented whenever the combinatorics of the diagram change.
+        self.revision = 0
+        self._invariants, self._invariants_revision = {}, 0
+        # Arrows which need to be redrawn because a crossing changed.
+        self.dirty_arrows = set()
+        # Arrows which have moved since their crossings were relocated.
+        self.moved_arrows = set()
+        # Caches the segments of each arrow used by polylines, which are
+        # discarded when the arrow or one of its crossings changes.
+        self._segments = {}
 
     def _from_string(self, contents):
-        lines = [line for line in contents.split('\n') if len(line) > 0]
-        num_lines = len(lines)
-        first_line = lines.pop(0)
-        has_virtual_crossings = first_line.startswith('% Virtual Link Projection')
-        if not (first_line.startswith('% Link Projection') or
-                first_line.startswith('% Virtual Link Projection')):
-            tkMessageBox.showwarning(
-                'Bad file',
-                'This is not a SnapPea link projection file')
-        else:
-            try:
-                vertices, arrows, crossings = [], [], []
-                num_components = int(lines.pop(0))
-                for n in range(num_components):
-                    lines.pop(0) # We don't need this
-                num_vertices = int(lines.pop(0))
-                for n in range(num_vertices):
-                    x, y = lines.pop(0).split()
-                    vertices.append( (x,y) )
-                num_arrows = int(lines.pop(0))
-                for n in range(num_arrows):
-                    s, e = lines.pop(0).split()
-                    arrows.append( (s,e) )
-                num_crossings = int(lines.pop(0))
-                for n in range(num_crossings):
-                    if has_virtual_crossings:
-                        v, u, o = lines.pop(0).split()
-                        v, u, o = v == 'v', int(u), int(o)
-                        crossings.append((u ,o, v, None))
-                    else:
-                        u, o = lines.pop(0).split()
-                        u, o = int(u), int(o)
-                        crossings.append((u,o, False, None))
-                h = int(lines[0])
-                hot = h if h != -1 else None
-            except:
-                tkMessageBox.showwarning(
-                    'Bad file',
-                    'Failed while parsing line %d' % (num_lines - len(lines)))
-            # make sure the window has been rendered before doing anything
-            self.unpickle(vertices, arrows, crossings)
-            self.update_crosspoints()
-            return hot
+        """
+        Loads the diagram described by the contents of a SnapPea link
+        projection file, and returns the index of the hot vertex, if
+        any.  Raises ProjectionFileError if the contents are invalid.
+        """
+        return self._from_stream(contents)
+
+    def _from_stream(self, stream):
+        """
+        Loads the diagram from a SnapPea link projection file, which
+        may be a string, a text or binary stream or an mmap, in one
+        pass.  Returns the index of the hot vertex, if any.  Raises
+        ProjectionFileError if the file is invalid.
+        """
+        vertices, arrows, crossings, hot = read_projection(stream)
+        self.unpickle(vertices, arrows, crossings)
+        self.update_crosspoints()
+        return hot
 
     def update_crosspoints(self):
+        """
+        Vectorizes every arrow and relocates every crossing, discarding
+        those whose arrows no longer cross.  Only the crossings which
+        have moved are refiled, so vertices which were moved without
+        calling vertex_moved also need rebuild_index.
+        """
         for arrow in self.Arrows:
             arrow.vectorize()
+        crossings = []
         for c in self.Crossings:
+            x, y = c.x, c.y
             c.locate()
-        self.Crossings = [ c for c in self.Crossings if c.x is not None]
-        self.CrossPoints = [Vertex(c.x, c.y, self.canvas, style='hidden')
-                            for c in self.Crossings]
+            if c.x is None:
+                self._unfile_crossing(c)
+                continue
+            if c.x != x or c.y != y:
+                self.file_crossing(c)
+            crossings.append(c)
+        if len(crossings) != len(self.Crossings):
+            self.bump_revision()
+        self.Crossings = crossings
+        self.moved_arrows.clear()
 
-    def arrow_components(self, include_isolated_vertices=False, distinguish_closed=False):
+    def relocate_crossings(self):
         """
-        Returns a list of components, given as lists of arrows.
-        The closed components are sorted in DT order if they have
-        been marked.  The others are sorted by age. If distinguish_closed
-        is set to True then two lists are returned, the first has the closed
-        components the second has the non-closed components.
+        Relocates and refiles the crossings on the arrows which have
+        moved since the last call, discarding those whose arrows no
+        longer cross.  This is update_crosspoints restricted to the
+        arrows reported by vertex_moved.
+        """
+        arrows, self.moved_arrows = self.moved_arrows, set()
+        relocated = {}
+        for arrow in arrows:
+            for crossing in self.arrow_crossings.get(arrow, ()):
+                relocated[crossing] = None
+        for crossing in relocated:
+            x, y = crossing.x, crossing.y
+            crossing.locate()
+            if crossing.x is None:
+                self.remove_crossing(crossing)
+                self.dirty_arrows.update((crossing.over, crossing.under))
+            elif crossing.x != x or crossing.y != y:
+                self.file_crossing(crossing)
+
+    @property
+    def CrossPoints(self):
+        """
+        Hidden vertices located at the crossings.  These are derived
+        from the crossings, which are kept up to date as arrows move.
+        """
+        return [Vertex(c.x, c.y, self.canvas, style='hidden')
+                for c in self.Crossings if c.x is not None]
+
+    def rebuild_index(self):
+        """
+        Refiles every vertex, arrow and crossing in the spatial grids.
+        """
+        for grid in (self.vertex_grid, self.arrow_grid, self.crossing_grid):
+            grid.clear()
+        self._segments = {}
+        self.arrow_crossings = {arrow: {} for arrow in self.Arrows}
+        for arrow in list(self._crossings_along):
+            self._order_may_change(arrow)
+        for crossing in self.Crossings:
+            for arrow in (crossing.over, crossing.under):
+                self.arrow_crossings.setdefault(arrow, {})[crossing] = None
+        for vertex in self.Vertices:
+            self.vertex_grid.insert(vertex, vertex.x, vertex.y)
+        for arrow in self.Arrows:
+            self.arrow_grid.insert(arrow, *self._extent(arrow))
+        for crossing in self.Crossings:
+            if crossing.x is not None:
+                self.crossing_grid.insert(crossing, crossing.x, crossing.y)
+
+    @staticmethod
+    def _extent(item):
+        """
+        The endpoints of an arrow, or the point of a vertex, as a
+        4-tuple of coordinates.
+        """
+        if isinstance(item, Arrow):
+            return item.start.x, item.start.y, item.end.x, item.end.y
+        return item.x, item.y, item.x, item.y
+
+    def add_vertex(self, vertex):
+        self.Vertices.append(vertex)
+        self.vertex_grid.insert(vertex, vertex.x, vertex.y)
+        self.topology_changed()
+
+    def remove_vertex(self, vertex):
+        # Vertices compare equal when they are close, so test identity.
+        self.Vertices = [v for v in self.Vertices if v is not vertex]
+        self.vertex_grid.remove(vertex)
+        self.topology_changed()
+
+    def add_arrow(self, arrow):
+        self.Arrows.append(arrow)
+        self.arrow_grid.insert(arrow, *self._extent(arrow))
+        self.arrow_crossings[arrow] = {}
+        self.topology_changed()
+
+    def remove_arrow(self, arrow):
+        self.Arrows.remove(arrow)
+        self.arrow_grid.remove(arrow)
+        self.arrow_crossings.pop(arrow, None)
+        self.dirty_arrows.discard(arrow)
+        self.moved_arrows.discard(arrow)
+        self._segments.pop(arrow, None)
+        self.topology_changed()
+
+    def add_crossing(self, crossing):
+        self.Crossings.append(crossing)
+        self.file_crossing(crossing)
+        for arrow in (crossing.over, crossing.under):
+            self.arrow_crossings.setdefault(arrow, {})[crossing] = None
+        self.bump_revision()
+
+    def remove_crossing(self, crossing):
+        self.Crossings = [c for c in self.Crossings if c is not crossing]
+        self._unfile_crossing(crossing)
+        self.bump_revision()
+
+    def _unfile_crossing(self, crossing):
+        """
+        Removes a crossing from the grid and from its arrows.
+        """
+        self.crossing_grid.remove(crossing)
+        for arrow in (crossing.over, crossing.under):
+            self.arrow_crossings.get(arrow, {}).pop(crossing, None)
+            self._order_may_change(arrow)
+            self._segments.pop(arrow, None)
+
+    def crossings_on(self, arrow):
+        """
+        Returns a list of the crossings which involve the arrow.
+        """
+        return list(self.arrow_crossings.get(arrow, ()))
+
+    def crossings_along(self, arrow):
+        """
+        Returns a list of the crossings which involve the arrow, sorted
+        by their heights along it.  The sorted lists are cached until
+        one of their crossings is added, removed or relocated.  If the
+        order has changed, as in a Reidemeister III move, the revision
+        is bumped.
+        """
+        crossings = self._crossings_along.get(arrow)
+        if crossings is None:
+            crossings = sorted(self.arrow_crossings.get(arrow, ()),
+                               key=lambda c: c.height(arrow))
+            self._crossings_along[arrow] = crossings
+            old = self._old_orders.pop(arrow, None)
+            if old is not None and (len(old) != len(crossings) or
+                any(a is not b for a, b in zip(old, crossings))):
+                self.bump_revision()
+        return list(crossings)
+
+    def _order_may_change(self, arrow):
+        """
+        Discards the sorted crossings of an arrow, remembering their
+        order so that crossings_along can tell whether it changed.
+        """
+        crossings = self._crossings_along.pop(arrow, None)
+        if crossings is not None:
+            self._old_orders.setdefault(arrow, crossings)
+
+    def crossing_changed(self, crossing):
+        """
+        Records that a crossing has been reversed or made virtual or
+        classical, so that only its two arrows need to be redrawn.
+        """
+        self.dirty_arrows.update((crossing.over, crossing.under))
+        self._segments.pop(crossing.over, None)
+        self._segments.pop(crossing.under, None)
+        self.bump_revision()
+
+    def bump_revision(self):
+        """
+        Records a change to the combinatorics of the diagram, which
+        invalidates the memoized invariants.
+        """
+        self.revision += 1
+
+    def _check_revision(self):
+        """
+        Re-sorts any crossings which may have been reordered, so that
+        the revision is current, and discards stale invariants.
+        """
+        for arrow in list(self._old_orders):
+            if arrow in self.arrow_crossings:
+                self.crossings_along(arrow)
+            else:
+                del self._old_orders[arrow]
+        if self._invariants_revision != self.revision:
+            self._invariants, self._invariants_revision = {}, self.revision
+
+    def file_arrow(self, arrow):
+        """
+        Refiles an arrow of the diagram after one of its ends has moved.
+        """
+        self.arrow_grid.insert(arrow, *self._extent(arrow))
+
+    def file_crossing(self, crossing):
+        """
+        Refiles a crossing of the diagram after it has been located.
+        """
+        if crossing.x is None:
+            self.crossing_grid.remove(crossing)
+        else:
+            self.crossing_grid.insert(crossing, crossing.x, crossing.y)
+        for arrow in (crossing.over, crossing.under):
+            self._order_may_change(arrow)
+            self._segments.pop(arrow, None)
+
+    def vertex_moved(self, vertex):
+        """
+        Refiles a vertex of the diagram which has been moved, along with
+        its arrows, which are vectorized.  Their crossings are relocated
+        by relocate_crossings.
+        """
+        self.vertex_grid.insert(vertex, vertex.x, vertex.y)
+        for arrow in (vertex.in_arrow, vertex.out_arrow):
+            if arrow:
+                arrow.vectorize()
+                self.file_arrow(arrow)
+                self.moved_arrows.add(arrow)
+                self._segments.pop(arrow, None)
+                # The heights of the crossings on the arrow have changed.
+                for crossing in self.arrow_crossings.get(arrow, ()):
+                    self._order_may_change(crossing.over)
+                    self._order_may_change(crossing.under)
+
+    def diagram_store(self):
+        """
+        Returns a DiagramStore holding a copy of the diagram in flat
+        arrays, for export or for sharing with other processes.
         """
+        return DiagramStore.from_manager(self)
+
+    def translate(self, dx, dy):
+        """
+        Moves the whole diagram by (dx, dy).
+        """
+        for vertex in self.Vertices:
+            vertex.x += dx
+            vertex.y += dy
+        for arrow in self.Arrows:
+            arrow.vectorize()
+        for crossing in self.Crossings:
+            if crossing.x is not None:
+                crossing.x += dx
+                crossing.y += dy
+        for grid in (self.vertex_grid, self.arrow_grid, self.crossing_grid):
+            grid.translate(dx, dy)
+        self._segments = {}
+
+    def vertices_near(self, item, distance):
+        """
+        Returns a list of vertices which includes all vertices within
+        the given distance of a vertex or an arrow.
+        """
+        return self.vertex_grid.find(*self._extent(item), pad=distance)
+
+    def arrows_near(self, item, distance=0.0):
+        """
+        Returns a list of arrows which includes all arrows within the
+        given distance of a vertex or an arrow.
+        """
+        return self.arrow_grid.find(*self._extent(item), pad=distance)
+
+    def crossings_near(self, item, distance):
+        """
+        Returns a list of crossings which includes all crossings within
+        the given distance of a vertex or an arrow.
+        """
+        return self.crossing_grid.find(*self._extent(item), pad=distance)
+
+    def find_vertex(self, point, exclude=None, endpoints_only=False):
+        """
+        Returns the vertex of the diagram closest to the point, among
+        those which are equal to it in the sense of Vertex.__eq__, or
+        None if there is no such vertex.
+        """
+        distance = lambda v: abs(v.x - point.x) + abs(v.y - point.y)
+        candidates = [v for v in self.vertices_near(point, Vertex.epsilon)
+                      if v == point and v is not exclude and
+                      (v.is_endpoint() or not endpoints_only)]
+        return min(candidates, key=distance) if candidates else None
+
+    def find_crossing(self, point):
+        """
+        Returns the crossing of the diagram closest to the point, among
+        those located within Vertex.epsilon of it, or None.
+        """
+        distance = lambda c: abs(c.x - point.x) + abs(c.y - point.y)
+        candidates = [c for c in self.crossings_near(point, Vertex.epsilon)
+                      if distance(c) < Vertex.epsilon]
+        return min(candidates, key=distance) if candidates else None
+
+    def recompute_all_crossings(self):
+        """
+        Rebuilds the list of crossings from the geometry of the arrows,
+        using a sweep line.  Existing crossings whose arrows still
+        cross are kept, in their current order, so their over/under
+        data, virtual flags and labels survive.  Each new crossing is
+        appended with the arrow which comes later in the list of
+        arrows on top, as if the arrows had been drawn in order.
+        """
+        for arrow in self.Arrows:
+            arrow.vectorize()
+        pairs = {}
+        for under, over, t in find_crossings(self.Arrows):
+            pairs[frozenset((id(under), id(over)))] = (under, over)
+        crossings = []
+        for crossing in self.Crossings:
+            if pairs.pop(frozenset((id(crossing.under), id(crossing.over))), None):
+                crossings.append(crossing)
+        for under, over in pairs.values():
+            crossings.append(Crossing(over, under))
+        self.Crossings = crossings
+        self.bump_revision()
+        self.update_crosspoints()
+        self.rebuild_index()
+
+    def topology_changed(self):
+        """
+        Discards the cached components of the diagram.  This must be
+        called whenever arrows are added, removed, reversed or joined
+        together.  Moving vertices does not change the components.
+        """
+        self._components = None
+        # Reversing an arrow reverses the order of its crossings.
+        self._crossings_along, self._old_orders = {}, {}
+        self._segments = {}
+        self.bump_revision()
+
+    def _find_components(self):
+        """
+        Walks along the arrows, visiting each one once, and returns
+        lists of the closed and non-closed components.  Each component
+        is given as a pair (arrows, age), where age is the smallest
+        index in self.Vertices of a vertex of the component.
+        """
+        index = {id(v): n for n, v in enumerate(self.Vertices)}
+        num_vertices = len(self.Vertices)
+        def oldest_vertex(component):
+            return min([num_vertices] + [index.get(id(v), num_vertices)
+                        for a in component for v in (a.start, a.end) if v])
         pool = [v.out_arrow for v in self.Vertices if v.in_arrow is None]
         pool += [v.out_arrow  for v in self.Vertices if v.in_arrow is not None]
+        visited = set()
         closed, nonclosed = [], []
-        while pool:
-            first_arrow = pool.pop(0)
-            if first_arrow is None:
+        for first_arrow in pool:
+            if first_arrow is None or id(first_arrow) in visited:
                 continue
+            visited.add(id(first_arrow))
             component = [first_arrow]
             while component[-1].end is not component[0].start:
                 next_arrow = component[-1].end.out_arrow
                 if next_arrow is None:
                     break
-                pool.remove(next_arrow)
+                if id(next_arrow) in visited:
+                    raise ValueError('The arrows do not form a PL link.')
+                visited.add(id(next_arrow))
                 component.append(next_arrow)
-            if next_arrow is None:
-                nonclosed.append(component)
+            if component[-1].end is component[0].start:
+                closed.append((component, oldest_vertex(component)))
             else:
-                closed.append(component)
+                nonclosed.append((component, oldest_vertex(component)))
+        return closed, nonclosed
+
+    def arrow_components(self, include_isolated_vertices=False, distinguish_closed=False):
+        """
+        Returns a list of components, given as lists of arrows.
+        The closed components are sorted in DT order if they have
+        been marked.  The others are sorted by age. If distinguish_closed
+        is set to True then two lists are returned, the first has the closed
+        components the second has the non-closed components.
+
+        The components are cached until topology_changed is called.
+        """
+        if self._components is None:
+            self._components = self._find_components()
+        closed, nonclosed = [[(list(component), age) for component, age in components]
+                             for components in self._components]
         if include_isolated_vertices:
-            for vertex in [v for v in self.Vertices if v.is_isolated()]:
-                nonclosed.append([Arrow(vertex, vertex, self.canvas,
-                                        color=vertex.color)])
-        def oldest_vertex(component):
-            def oldest(arrow):
-                return min([self.Vertices.index(v)
-                            for v in [arrow.start, arrow.end] if v])
-            return min( [len(self.Vertices)] +  [oldest(a) for a in component])
-        closed.sort(key=lambda x : (x[0].component, oldest_vertex(x)))
-        nonclosed.sort(key=oldest_vertex)
+            for n, vertex in enumerate(self.Vertices):
+                if vertex.is_isolated():
+                    nonclosed.append(([Arrow(vertex, vertex, self.canvas,
+                                             color=vertex.color)], n))
+        closed.sort(key=lambda x : (x[0][0].component, x[1]))
+        nonclosed.sort(key=lambda x : x[1])
+        closed = [component for component, age in closed]
+        nonclosed = [component for component, age in nonclosed]
         return (closed, nonclosed) if distinguish_closed else closed + nonclosed
 
     def polylines(self, break_at_overcrossings=True):
@@ -158,14 +527,21 @@ class LinkManager:
         corresponds to maximal arcs with no crossings on their interior.
         """
         result = []
-        self.update_crosspoints()
+        self.relocate_crossings()
         segments = {}
         for arrow in self.Arrows:
-            arrows_segments = arrow.find_segments(
-                self.Crossings,
-                include_overcrossings=True)
-            segments[arrow] = [ [(x0, y0), (x1, y1)]
-                                for x0, y0, x1, y1 in arrows_segments]
+            # The gaps depend on the parameters, which may be changed.
+            params = arrow.params
+            gaps = (params['abs_gap_size'], params['rel_gap_size'],
+                    params['double_gap_at_ends'])
+            cached = self._segments.get(arrow)
+            if cached is None or cached[0] != gaps:
+                arrows_segments = arrow.find_segments(
+                    self.crossings_on(arrow),
+                    include_overcrossings=True)
+                cached = self._segments[arrow] = (gaps, [
+                    ((x0, y0), (x1, y1)) for x0, y0, x1, y1 in arrows_segments])
+            segments[arrow] = cached[1]
 
         if break_at_overcrossings:
             crossing_locations = set([(c.x, c.y) for c in self.Crossings])
@@ -177,17 +553,17 @@ class LinkManager:
             for arrow in component:
                 for segment in segments[arrow]:
                     if len(polyline) == 0:
-                        polyline = segment
+                        polyline = list(segment)
                     elif segment[0] == polyline[-1]:
                         if (break_at_overcrossings and
                             segment[0] in crossing_locations):
                                 polylines.append(polyline)
-                                polyline = segment
+                                polyline = list(segment)
                         else:
                             polyline.append(segment[1])
                     else:
                         polylines.append(polyline)
-                        polyline = segment
+                        polyline = list(segment)
             polylines.append(polyline)
             if polylines[0][0] == polylines[-1][-1]:
                 if len(polylines) > 1:
@@ -207,13 +583,8 @@ class LinkManager:
         result = []
         arrow_components = self.arrow_components()
         for component in arrow_components:
-            crosses=[]
-            for arrow in component:
-                arrow_crosses = [(c.height(arrow), c, arrow)
-                                for c in self.Crossings if arrow in c]
-                arrow_crosses.sort()
-                crosses += arrow_crosses
-            result.append([ECrossing(c[1],c[2]) for c in crosses])
+            result.append([ECrossing(c, arrow) for arrow in component
+                           for c in self.crossings_along(arrow)])
 
         for crossing in self.Crossings:
             crossing.clear_marks()
@@ -294,6 +665,7 @@ class LinkManager:
 
         return sorted_components
 
+    @memoized
     def SnapPea_KLPProjection(self):
         """
         Constructs a python simulation of a SnapPea KLPProjection
@@ -330,9 +702,9 @@ class LinkManager:
         num_crossings = len(self.Crossings)
         num_free_loops = 0
         num_components = len(components)
-        id = lambda x: self.Crossings.index(x.crossing)
-        for component in components:
-            this_component = components.index(component)
+        crossing_index = self.index_maps()[2]
+        index = lambda x: crossing_index[id(x.crossing)]
+        for this_component, component in enumerate(components):
             N = len(component)
             for n in range(N):
                 this = component[n]
@@ -340,15 +712,15 @@ class LinkManager:
                 next = component[(n+1)%N]
                 this.crossing.KLP['sign'] = sign = this.crossing.sign()
                 if this.strand == 'X':
-                    this.crossing.KLP['Xbackward_neighbor'] = id(previous)
+                    this.crossing.KLP['Xbackward_neighbor'] = index(previous)
                     this.crossing.KLP['Xbackward_strand'] = previous.strand
-                    this.crossing.KLP['Xforward_neighbor']  = id(next)
+                    this.crossing.KLP['Xforward_neighbor']  = index(next)
                     this.crossing.KLP['Xforward_strand'] = next.strand
                     this.crossing.KLP['Xcomponent'] = this_component
                 else:
-                    this.crossing.KLP['Ybackward_neighbor'] = id(previous)
+                    this.crossing.KLP['Ybackward_neighbor'] = index(previous)
                     this.crossing.KLP['Ybackward_strand'] = previous.strand
-                    this.crossing.KLP['Yforward_neighbor']  = id(next)
+                    this.crossing.KLP['Yforward_neighbor']  = index(next)
                     this.crossing.KLP['Yforward_strand'] = next.strand
                     this.crossing.KLP['Ycomponent'] = this_component
             if N == 0:
@@ -356,6 +728,7 @@ class LinkManager:
         KLP_crossings = [crossing.KLP for crossing in self.Crossings]
         return num_crossings, num_free_loops, num_components, KLP_crossings
 
+    @memoized
     def PD_code(self):
         """
         Return the PD (Planar Diagram) code for the link projection,
@@ -386,6 +759,7 @@ class LinkManager:
                 PD.append( (under[0], over[0], under[1], over[1]) )
         return PD
 
+    @memoized
     def DT_code(self, alpha=False, signed=True, return_sizes=False):
         """
         Return the Dowker-Thistlethwaite code as a list of tuples of
@@ -397,6 +771,9 @@ class LinkManager:
 
         If return_sizes is set to True, a list of the number of crossings
         in each component is returned (this is for use by Gauss_code).
+
+        Raises ValueError if an alphabetical code is requested for a
+        diagram with more than 26 crossings.
         """
         sorted_components = self.sorted_components()
         if sorted_components is None or len(sorted_components) == 0:
@@ -433,10 +810,8 @@ class LinkManager:
             prefix_ints = [len(self.Crossings), len(sorted_components)]
             prefix_ints += DT_chunks
             if prefix_ints[0] > 26:
-                tkMessageBox.showwarning(
-                    'Error',
+                raise ValueError(
                     'Alphabetical DT codes require fewer than 26 crossings.')
-                return None
             alphacode = ''.join(tuple([DT_alphabet[n>>1] for n in even_codes]))
             prefix = ''.join(tuple([DT_alphabet[n] for n in prefix_ints]))
             if signed:
@@ -446,6 +821,19 @@ class LinkManager:
             result.append(component_sizes)
         return tuple(result)
 
+    @memoized
+    def DT_hits(self):
+        """
+        Return a list of the DT hit counters of the crossings, as
+        triples (hit1, hit2, flipped) set by sorted_components, or None
+        if not all components are closed.
+        """
+        if self.sorted_components() is None:
+            return None
+        return [(crossing.hit1, crossing.hit2, crossing.flipped)
+                for crossing in self.Crossings]
+
+    @memoized
     def Gauss_code(self):
         """
         Return a Gauss code for the link.  The Gauss code is computed
@@ -476,6 +864,7 @@ class LinkManager:
             start = end
         return gauss
 
+    @memoized
     def BB_framing(self):
         """
         Return the standard meridian-longitude coordinates of the
@@ -549,40 +938,54 @@ class LinkManager:
         if framing:
             self.write_text(('BB framing:  %s'%framing).replace(', ',','))
 
+    def index_maps(self):
+        """
+        Returns three dicts mapping the ids of the vertices, arrows and
+        crossings to their positions in self.Vertices, self.Arrows and
+        self.Crossings.  These replace calls to list.index, which take
+        linear time and use the fuzzy equality of vertices.
+        """
+        return ({id(v): n for n, v in enumerate(self.Vertices)},
+                {id(a): n for n, a in enumerate(self.Arrows)},
+                {id(c): n for n, c in enumerate(self.Crossings)})
+
     def SnapPea_projection_file(self):
         """
         Returns a string containing the contents of a SnapPea link
         projection file.
         """
-        has_virtual_crossings = any(crossing.is_virtual for crossing in self.Crossings)
+        output = io.StringIO()
+        self.write_SnapPea_projection_file(output)
+        return output.getvalue()
 
-        result = ''
-        result += '% Virtual Link Projection\n' if has_virtual_crossings else '% Link Projection\n'
+    def write_SnapPea_projection_file(self, stream):
+        """
+        Writes the contents of a SnapPea link projection file to a text
+        stream, one line at a time.
+        """
+        has_virtual_crossings = any(crossing.is_virtual for crossing in self.Crossings)
+        V, A, _ = self.index_maps()
+        write, writelines = stream.write, stream.writelines
+        write('% Virtual Link Projection\n' if has_virtual_crossings else '% Link Projection\n')
         components = self.arrow_components()
-        result += '%d\n'%len(components)
-        for component in components:
-            first = self.Vertices.index(component[0].start)
-            last = self.Vertices.index(component[-1].end)
-            result +='%4.1d %4.1d\n'%(first, last)
-        result += '%d\n'%len(self.Vertices)
-        for vertex in self.Vertices:
-            result += '%5.1d %5.1d\n'%vertex.point()
-        result += '%d\n'%len(self.Arrows)
-        for arrow in self.Arrows:
-            start_index = self.Vertices.index(arrow.start)
-            end_index = self.Vertices.index(arrow.end)
-            result += '%4.1d %4.1d\n'%(start_index, end_index)
-        result += '%d\n'%len(self.Crossings)
+        write('%d\n'%len(components))
+        writelines('%4.1d %4.1d\n'%(V[id(component[0].start)], V[id(component[-1].end)])
+                   for component in components)
+        write('%d\n'%len(self.Vertices))
+        writelines('%5.1d %5.1d\n'%vertex.point() for vertex in self.Vertices)
+        write('%d\n'%len(self.Arrows))
+        writelines('%4.1d %4.1d\n'%(V[id(arrow.start)], V[id(arrow.end)])
+                   for arrow in self.Arrows)
+        write('%d\n'%len(self.Crossings))
         for crossing in self.Crossings:
-            under = self.Arrows.index(crossing.under)
-            over = self.Arrows.index(crossing.over)
+            under = A[id(crossing.under)]
+            over = A[id(crossing.over)]
             is_virtual = 'v' if crossing.is_virtual else 'r'
-            result += '%4s %4.1d %4.1d\n'%(is_virtual, under, over) if has_virtual_crossings else '%4.1d %4.1d\n'%(under, over)
+            write('%4s %4.1d %4.1d\n'%(is_virtual, under, over) if has_virtual_crossings else '%4.1d %4.1d\n'%(under, over))
         if self.ActiveVertex:
-            result += '%d\n'%self.Vertices.index(self.ActiveVertex)
+            write('%d\n'%V[id(self.ActiveVertex)])
         else:
-            result += '-1\n'
-        return result
+            write('-1\n')
 
     def twister_surface_file(self):
         """
@@ -627,16 +1030,61 @@ class LinkManager:
             i += 1
         return result
 
+    def save_as_svg(self, file_name, colormode='color', width=None):
+        """
+        Saves the PL link diagram as an SVG file, written directly from
+        the polylines, so no canvas or display is needed.  Only the
+        strands are drawn, with the width of the lines on the canvas,
+        and not the arrowheads, vertices or virtual crossings.  The
+        colormode is currently ignored.  The width option sets the width
+        of the figure in pixels; by default it has the size of the diagram.
+        """
+        polylines = self.polylines(break_at_overcrossings=False)
+        SVG = SVGPicture(file_name, bounds(
+            xy for lines, color in polylines for line in lines for xy in line),
+            width, line_width=3)
+        for lines, color in polylines:
+            for line in lines:
+                SVG.polyline(line, color)
+        SVG.save()
+
+    def save_as_pdf(self, file_name, colormode='color', width=312.0):
+        """
+        Saves the PL link diagram as a PDF file, using PyX.  The bounds
+        are computed from the polylines, so no canvas is needed.  The
+        colormode is currently ignored.  The width option sets the width
+        of the figure in points.
+        """
+        self._save_with_pyx(file_name, 'pdf', width)
+
+    def save_as_eps(self, file_name, colormode='color', width=312.0):
+        """
+        Saves the PL link diagram as an encapsulated postscript file,
+        using PyX, without a canvas.  The colormode is currently ignored.
+        """
+        self._save_with_pyx(file_name, 'eps', width)
+
+    def _save_with_pyx(self, file_name, file_type, width):
+        polylines = self.polylines(break_at_overcrossings=False)
+        PDF = PDFPicture(None, width, bounds(
+            xy for lines, color in polylines for line in lines for xy in line))
+        for lines, color in polylines:
+            for line in lines:
+                PDF.polyline(line, color)
+        PDF.save(file_name, file_type)
+
     def save_as_tikz(self, file_name, colormode='color', width=282.0):
         polylines = self.polylines(break_at_overcrossings=True)
         colors = [polyline[-1] for polyline in polylines]
-        tikz = TikZPicture(self.canvas, colors, width)
+        tikz = TikZPicture(None, colors, width, bounds(
+            xy for lines, color in polylines for line in lines for xy in line),
+            output=file_name)
         for polyline in polylines:
             for line in polyline[0]:
                 points = ['(%.2f, %.2f)' % tikz.transform(xy) for xy in line]
                 tikz.write(polyline[1],
                            '    \\draw ' + ' -- '.join(points) + ';\n')
-        tikz.save(file_name)
+        tikz.save()
 
     def unpickle(self, vertices, arrows, crossings, hot=None):
         """
@@ -649,7 +1097,9 @@ class LinkManager:
            * crossings: a list of quadruples (under, over, is_virtual, label),
            giving the indices in the arrow list of each pair of crossing
            arrows, a boolean indicating if the crossing is virtual,
-           and an assigned label.
+           and an assigned label.  If crossings is None then the
+           crossings are computed from the geometry, see
+           recompute_all_crossings.
 
            * an optional argument "hot" giving the index of one vertex
            which was being added at the time the diagram was pickled
@@ -662,20 +1112,24 @@ class LinkManager:
         for start, end in arrows:
             S, E = self.Vertices[int(start)], self.Vertices[int(end)]
             self.Arrows.append(Arrow(S, E, self.canvas))
+        self.topology_changed()
+        if crossings is None:
+            self.recompute_all_crossings()
+            return
         for under, over, is_virtual, label in crossings:
             U, O, V, L = self.Arrows[int(under)], self.Arrows[int(over)], bool(is_virtual), str(label)
             self.Crossings.append(Crossing(O, U, V, L))
+        self.rebuild_index()
 
     def pickle(self):
         """
         Inverse of unpickle.
         """
-        V = lambda v: self.Vertices.index(v)
-        A = lambda a: self.Arrows.index(a)
+        V, A, _ = self.index_maps()
         vertices = [(v.x, v.y) for v in self.Vertices]
-        arrows = [(V(a.start), V(a.end)) for a in self.Arrows]
-        crossings = [(A(c.under), A(c.over), c.is_virtual, c.label) for c in self.Crossings]
-        hot = V(self.ActiveVertex) if self.ActiveVertex else None
+        arrows = [(V[id(a.start)], V[id(a.end)]) for a in self.Arrows]
+        crossings = [(A[id(c.under)], A[id(c.over)], c.is_virtual, c.label) for c in self.Crossings]
+        hot = V[id(self.ActiveVertex)] if self.ActiveVertex else None
         return [vertices, arrows, crossings, hot]
 
     def create_colors(self):
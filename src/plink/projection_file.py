@@ -0,0 +1,198 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module exports the function read_projection, which parses a
+SnapPea link projection file in a single pass, and the exception
+ProjectionFileError which it raises when the file is invalid.
+
+A link projection file looks like this, where blank lines are ignored
+and the crossings and the hot vertex may be omitted:
+
+  % Link Projection      (or % Virtual Link Projection)
+  <number of components>
+  <first vertex> <last vertex>    (one line per component)
+  <number of vertices>
+  <x> <y>                         (one line per vertex)
+  <number of arrows>
+  <start vertex> <end vertex>     (one line per arrow)
+  <number of crossings>
+  <under arrow> <over arrow>      (one line per crossing, preceded by
+                                   v or r in a virtual link projection)
+  <index of the hot vertex, or -1>
+"""
+
+import io, re
+
+
+class ProjectionFileError(ValueError):
+    """
+    Raised when the contents of a SnapPea link projection file cannot
+    be parsed.  The line and column where the problem was found, both
+    numbered from 1, are available as attributes.
+    """
+    def __init__(self, message, line=None, column=None):
+        self.message, self.line, self.column = message, line, column
+        if line is not None:
+            if column is not None:
+                message = 'Line %d, column %d: %s' % (line, column, message)
+            else:
+                message = 'Line %d: %s' % (line, message)
+        ValueError.__init__(self, message)
+
+
+_field = re.compile(r'\S+')
+
+
+def _numbered_lines(source):
+    """
+    Generates pairs (line number, line) for the non-blank lines of a
+    string, a bytes object, or any object with a readline method, such
+    as a text or binary file or an mmap.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    readline = source.readline
+    number = 0
+    while True:
+        line = readline()
+        if not line:
+            return
+        number += 1
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode('latin-1')
+        if not line.isspace():
+            yield number, line
+
+
+class _Reader:
+    """
+    Reads the lines of a link projection file one at a time, splitting
+    them into fields and reporting errors with their positions.
+    """
+    def __init__(self, source):
+        self.lines = _numbered_lines(source)
+        self.number, self.line = 0, ''
+
+    def next_line(self, what, optional=False):
+        """
+        Returns the next non-blank line.  At the end of the file this
+        returns None if the line is optional, and raises otherwise.
+        """
+        try:
+            self.number, self.line = next(self.lines)
+        except StopIteration:
+            if optional:
+                return None
+            raise ProjectionFileError(
+                'The file ended while reading %s.' % what,
+                self.number + 1) from None
+        return self.line
+
+    def error(self, message, field=None):
+        column = None
+        if field is not None:
+            fields = list(_field.finditer(self.line))
+            if field < len(fields):
+                column = fields[field].start() + 1
+            else:
+                column = len(self.line.rstrip()) + 1
+        return ProjectionFileError(message, self.number, column)
+
+    def fields(self, count, what, optional=False):
+        line = self.next_line(what, optional)
+        if line is None:
+            return None
+        fields = line.split()
+        if len(fields) != count:
+            raise self.error('Expected %d fields for %s but found %d.' % (
+                count, what, len(fields)), min(count, len(fields)))
+        return fields
+
+    def integer(self, text, field, low=None, high=None):
+        try:
+            value = int(text)
+        except ValueError:
+            raise self.error(
+                'Expected an integer but found %r.' % text, field) from None
+        if (low is not None and value < low) or (
+                high is not None and value >= high):
+            raise self.error('The index %d is out of range.' % value, field)
+        return value
+
+    def real(self, text, field):
+        try:
+            return float(text)
+        except ValueError:
+            raise self.error(
+                'Expected a number but found %r.' % text, field) from None
+
+    def count(self, what, optional=False):
+        fields = self.fields(1, 'the number of %s' % what, optional)
+        if fields is None:
+            return None
+        return self.integer(fields[0], 0, low=0)
+
+
+def read_projection(source):
+    """
+    Parses a SnapPea link projection file, given as a string, a bytes
+    object, a text or binary stream or an mmap, reading each line once.
+    Returns a tuple (vertices, arrows, crossings, hot) of the form
+    accepted by LinkManager.unpickle.  The crossings and hot vertex are
+    None if the file ends after the arrows.  Raises ProjectionFileError,
+    with the line and column of the problem, if the file is invalid.
+    """
+    reader = _Reader(source)
+    first_line = reader.next_line('the header', optional=True) or ''
+    is_virtual_link = first_line.startswith('% Virtual Link Projection')
+    if not (is_virtual_link or first_line.startswith('% Link Projection')):
+        raise ProjectionFileError(
+            'This is not a SnapPea link projection file', reader.number or 1, 1)
+    for n in range(reader.count('components')):
+        reader.next_line('the components') # We don't need these
+    num_vertices = reader.count('vertices')
+    vertices = []
+    for n in range(num_vertices):
+        x, y = reader.fields(2, 'a vertex')
+        vertices.append((reader.real(x, 0), reader.real(y, 1)))
+    arrows = []
+    for n in range(reader.count('arrows')):
+        s, e = reader.fields(2, 'an arrow')
+        arrows.append((reader.integer(s, 0, 0, num_vertices),
+                       reader.integer(e, 1, 0, num_vertices)))
+    num_crossings = reader.count('crossings', optional=True)
+    if num_crossings is None:
+        # The file ends after the arrows, so the crossings must be
+        # rebuilt from the geometry.
+        return vertices, arrows, None, None
+    crossings = []
+    num_arrows = len(arrows)
+    for n in range(num_crossings):
+        if is_virtual_link:
+            v, u, o = reader.fields(3, 'a crossing')
+            first = 1
+        else:
+            u, o = reader.fields(2, 'a crossing')
+            v, first = 'r', 0
+        crossings.append((reader.integer(u, first, 0, num_arrows),
+                          reader.integer(o, first + 1, 0, num_arrows),
+                          v == 'v', None))
+    fields = reader.fields(1, 'the hot vertex', optional=True)
+    if fields is None:
+        return vertices, arrows, crossings, None
+    hot = reader.integer(fields[0], 0, -1, len(vertices))
+    return vertices, arrows, crossings, hot if hot != -1 else None
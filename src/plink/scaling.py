@@ -34,8 +34,9 @@ def set_scale_factor(scale_factor='auto'):
     Vertex.set_scale(scale_factor)
     from .arrow import Arrow
     Arrow.set_scale(scale_factor)
-    from .smooth import SmoothArc, PDFPicture, TikZPicture
+    from .smooth import SmoothArc, PDFPicture, TikZPicture, SVGPicture
     SmoothArc.set_scale(scale_factor)
     PDFPicture.set_scale(scale_factor)
     TikZPicture.set_scale(scale_factor)
+    SVGPicture.set_scale(scale_factor)
     scale_set = True
@@ -41,18 +41,27 @@
 # with caps on the velocities to remove some unnecessary inflection points.
 #from builtins import range
 
-try:
-    import tkinter as Tk_
-    from . import canvasvg
-except ImportError:  # Tk unavailable or misconfigured
-    Tk_, canvasvg = None, None
+# PyX is slow to import, so it is only loaded by the first PDF or EPS
+# export; see load_pyx.
+pyx = None
 
-try:
-    import pyx
-except ImportError:
-    pass
+# Below this many spline segments the arrays cost more to build than
+# they save.
+numpy_cutoff = 64
 
+import io
 from math import sqrt, cos, sin, atan2, pi
+from .intersect import load_numpy
+
+def load_pyx():
+    """
+    Imports PyX, if that has not been done yet, and returns it.  Raises
+    ImportError if PyX is not installed.
+    """
+    global pyx
+    if pyx is None:
+        import pyx
+    return pyx
 
 def in_twos(L):
     assert len(L) % 2 == 0
@@ -150,29 +159,44 @@ class SmoothArc:
         """
         Return a list of spline knots and control points for the Bezier
         spline, in format [ ... Knot, Control, Control, Knot ...]
+        The list is computed once and cached.
         """
+        try:
+            return self._bezier
+        except AttributeError:
+            pass
         path = []
         for k in range(len(self.spline_knots)-1):
             path += self._curve_to(k)
         path.append(self.spline_knots[-1])
+        self._bezier = path
         return path
 
     def tk_clear(self):
         for item in self.canvas_items:
             self.canvas.delete(item)
+        self.canvas_items = []
 
     def tk_draw(self, thickness=4):
+        """
+        Draw the spline, reusing its canvas item if it has one.
+        """
         if SmoothArc.scale_factor == 2:
             thickness = 6
         XY = self.bezier()
-        self.tk_clear()
+        if self.canvas_items:
+            item = self.canvas_items[0]
+            self.canvas.coords(item, *[t for xy in XY for t in xy])
+            self.canvas.itemconfig(item, width=thickness, fill=self.color)
+            return
         self.canvas_items.append(self.canvas.create_line(
             *XY, smooth='raw', width=thickness, fill=self.color,
-             capstyle=Tk_.ROUND, splinesteps=100,
+             capstyle='round', splinesteps=100,
              tags=('smooth','transformable')))
 
     def pyx_draw(self, canvas, transform, base_style):
         XY = [transform(xy) for xy in self.bezier()]
+        load_pyx()
         arc_parts = [pyx.path.moveto(*XY[0])]
         for i in range(1, len(XY), 3):
             arc_parts.append(pyx.path.curveto(XY[i][0], XY[i][1],
@@ -183,12 +207,77 @@ class SmoothArc:
 
     def tikz_draw(self, file, transform):
         points = ['(%.2f, %.2f)' % transform(xy) for xy in self.bezier()]
-        file.write(self.color, '    \\draw %s .. controls %s and %s .. ' % tuple(points[:3]))
+        parts = ['    \\draw %s .. controls %s and %s .. ' % tuple(points[:3])]
         for i in range(3, len(points) - 3, 3):
-            file.write(self.color, '\n' + 10*' ' + '%s .. controls %s and %s .. ' % tuple(points[i:i+3]))
-        file.write(self.color, points[-1] + ';\n')
+            parts.append('\n' + 10*' ' + '%s .. controls %s and %s .. ' % tuple(points[i:i+3]))
+        parts.append(points[-1] + ';\n')
+        file.write(self.color, ''.join(parts))
 
 
+def compute_beziers(curves):
+    """
+    Compute and cache the Bezier splines of a list of SmoothArcs and
+    SmoothLoops.  When NumPy is available the control points of all of
+    the curves are computed together, with the same formulas as
+    SmoothArc._curve_to; otherwise each curve computes its own.
+    Curves whose splines are already cached are skipped.
+    """
+    curves = [C for C in curves if not hasattr(C, '_bezier')]
+    size = sum(len(C.spline_knots) - 1 for C in curves)
+    numpy = load_numpy() if size >= numpy_cutoff else None
+    if numpy is None:
+        for curve in curves:
+            curve.bezier()
+        return
+    # Building one array per coordinate is much faster than building
+    # a 2-dimensional array from a list of tuples.
+    knots = [p for C in curves for p in C.spline_knots]
+    tangents = [v for C in curves for v in C.tangents]
+    Kx = numpy.array([p[0] for p in knots], dtype=numpy.float64)
+    Ky = numpy.array([p[1] for p in knots], dtype=numpy.float64)
+    Tx = numpy.array([v[0] for v in tangents], dtype=numpy.float64)
+    Ty = numpy.array([v[1] for v in tangents], dtype=numpy.float64)
+    tension1 = numpy.array([C.tension1 for C in curves
+                            for p in C.spline_knots])
+    tension2 = numpy.array([C.tension2 for C in curves
+                            for p in C.spline_knots])
+    # The spline segment from each knot to the next one.  The segments
+    # which join the last knot of a curve to the first knot of the
+    # next curve are computed too, and then ignored.
+    Ax, Ay, Bx, By = Kx[:-1], Ky[:-1], Kx[1:], Ky[1:]
+    vAx, vAy, vBx, vBy = Tx[:-1], Ty[:-1], Tx[1:], Ty[1:]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        A_speed_max = numpy.hypot(vAx, vAy)
+        B_speed_max = numpy.hypot(vBx, vBy)
+        l = numpy.hypot(Bx - Ax, By - Ay)
+        psi = numpy.arctan2(By - Ay, Bx - Ax)
+        theta = numpy.arctan2(vAy, vAx) - psi
+        phi = psi - numpy.arctan2(vBy, vBx)
+        ctheta, stheta = numpy.cos(theta), numpy.sin(theta)
+        cphi, sphi = numpy.cos(phi), numpy.sin(phi)
+        a = sqrt(2.0)
+        b = 1.0/16.0
+        c = (3.0 - sqrt(5.0))/2.0
+        alpha = a*(stheta - b*sphi) * (sphi - b*stheta) * (ctheta - cphi)
+        rho = (2 + alpha) / ((1 + (1-c)*ctheta + c*cphi) * tension1[:-1])
+        sigma = (2 - alpha) / ((1 + (1-c)*cphi + c*ctheta) * tension2[:-1])
+        A_speed = numpy.minimum(l*rho/3, A_speed_max)
+        B_speed = numpy.minimum(l*sigma/3, B_speed_max)
+    # Each knot is followed by the two control points of its segment,
+    # as in the output of bezier().
+    path = numpy.empty((len(knots), 6))
+    path[:,0], path[:,1] = Kx, Ky
+    path[:-1,2] = Ax + A_speed*numpy.cos(psi + theta)
+    path[:-1,3] = Ay + A_speed*numpy.sin(psi + theta)
+    path[:-1,4] = Bx - B_speed*numpy.cos(psi - phi)
+    path[:-1,5] = By - B_speed*numpy.sin(psi - phi)
+    coords = path.ravel().tolist()
+    n = 0
+    for C in curves:
+        end = n + 6*len(C.spline_knots) - 4
+        C._bezier = list(map(TwoVector, coords[n:end:2], coords[n+1:end:2]))
+        n = end + 4
+
 class SmoothLoop(SmoothArc):
     """
     A Bezier spline that is tangent at the midpoints of segments in a
@@ -214,47 +303,87 @@ class SmoothLoop(SmoothArc):
 class Smoother:
     """
     An object that displays a smooth link image on a Tk canvas.
+
+    The curves are remembered by the geometry of their arcs, so that
+    when the polylines are replaced only the arcs which have changed
+    are recomputed, and their canvas items are reused where possible.
+    If the canvas is None nothing is drawn, but the curves can still be
+    saved as SVG, which needs no display.
     """
     def __init__(self, canvas):
         self.canvas = canvas
         self.canvas_items = []
         self.curves = []
+        self.thickness = None
+        self.tension1 = self.tension2 = 1.0
 
     def _build_curves(self):
+        """
+        Build the curves for the current polylines, taking unchanged
+        curves from the previous set.  Returns the new curves and the
+        old ones which were not reused.
+        """
+        old_curves = {}
+        for curve in self.curves:
+            old_curves.setdefault(curve.key, []).append(curve)
         self.curves = curves = []
         self.polygons = []
+        new_curves = []
         for polyline, color in self.polylines:
-            n = len(curves)
             polygon = []
             for arc in polyline:
                 polygon += arc[1:-1]
+                key = (tuple(arc), color)
+                if old_curves.get(key):
+                    curves.append(old_curves[key].pop())
+                    continue
                 if arc[0] == arc[-1]:
-                    A = SmoothLoop(self.canvas, arc, color,
+                    A = SmoothLoop(self.canvas, list(arc), color,
                         tension1=self.tension1, tension2=self.tension2)
-                    curves.append(A)
                 else:
                     A = SmoothArc(self.canvas, arc, color,
                         tension1=self.tension1, tension2=self.tension2)
-                    curves.append(A)
+                A.key = key
+                curves.append(A)
+                new_curves.append(A)
             self.polygons.append(polygon)
+        return new_curves, [C for L in old_curves.values() for C in L]
 
     def set_polylines(self, polylines, thickness=5,
                       tension1=1.0, tension2=1.0):
-        self.clear()
+        if (tension1, tension2) != (self.tension1, self.tension2):
+            self.clear()
         self.polylines = polylines
         self.vertices = []
         self.tension1 = tension1
         self.tension2 = tension2
-        self._build_curves()
-        self.draw(thickness=thickness)
+        new_curves, old_curves = self._build_curves()
+        compute_beziers(new_curves)
+        if self.canvas is None:
+            return
+        if thickness != self.thickness:
+            for curve in old_curves:
+                curve.tk_clear()
+            self.draw(thickness=thickness)
+            return
+        # Move the canvas items of discarded curves onto the new ones.
+        for curve in new_curves:
+            if old_curves:
+                old = old_curves.pop()
+                curve.canvas_items, old.canvas_items = old.canvas_items, []
+            curve.tk_draw(thickness=thickness)
+        for curve in old_curves:
+            curve.tk_clear()
 
     def draw(self, thickness=5):
+        self.thickness = thickness
         for curve in self.curves:
             curve.tk_draw(thickness=thickness)
 
     def clear(self):
         for curve in self.curves:
             curve.tk_clear()
+        self.curves = []
 
     def save_as_pdf(self, file_name, colormode='color', width=312.0):
         """
@@ -264,10 +393,15 @@ class Smoother:
         The width option sets the width of the figure in points.
         The default width is 312pt = 4.33in = 11cm .
         """
-        PDF = PDFPicture(self.canvas, width)
-        for curve in self.curves:
-            curve.pyx_draw(PDF.canvas, PDF.transform, PDF.base_line_style())
-        PDF.save(file_name)
+        self._save_with_pyx(file_name, 'pdf', width)
+
+    def _save_with_pyx(self, file_name, file_type, width):
+        paths = [curve.bezier() for curve in self.curves]
+        PDF = PDFPicture(None, width,
+                         bounds(xy for path in paths for xy in path))
+        for curve, path in zip(self.curves, paths):
+            PDF.bezier(path, curve.color)
+        PDF.save(file_name, file_type)
 
     def save_as_eps(self, file_name, colormode='color', width=312.0):
         """
@@ -276,34 +410,67 @@ class Smoother:
         The colormode must be 'color', 'gray', or 'mono'; default is 'color'.
         The width option sets the width of the figure in points.
         The default width is 312pt = 4.33in = 11cm .
+        Without a canvas the file is written by PyX, in color.
         """
-        save_as_eps(self.canvas, file_name, colormode, width)
+        if self.canvas is None:
+            self._save_with_pyx(file_name, 'eps', width)
+        else:
+            save_as_eps(self.canvas, file_name, colormode, width)
 
     def save_as_svg(self, file_name, colormode='color', width=None):
         """
+        Save the smooth link diagram as an SVG file, written directly
+        from the Bezier splines without using the canvas.
         The colormode (currently ignored) must be 'color', 'gray', or 'mono'.
-        The width option is ignored for svg images.
+        The width option sets the width of the figure in pixels; by
+        default the figure has the size of the diagram.
         """
-        save_as_svg(self.canvas, file_name, colormode, width)
+        paths = [curve.bezier() for curve in self.curves]
+        SVG = SVGPicture(file_name, bounds(xy for path in paths for xy in path),
+                         width)
+        for curve, path in zip(self.curves, paths):
+            SVG.bezier(path, curve.color)
+        SVG.save()
 
     def save_as_tikz(self, file_name, colormode='color', width=282.0):
         colors = [pl[-1] for pl in self.polylines]
-        tikz = TikZPicture(self.canvas, colors, width)
+        tikz = TikZPicture(None, colors, width, bounds(
+            xy for curve in self.curves for xy in curve.bezier()),
+            output=file_name)
         for curve in self.curves:
             curve.tikz_draw(tikz, tikz.transform)
-        tikz.save(file_name)
+        tikz.save()
 
 
 
 #----- Code for saving various file types ------
 
+def save_image(manager, file_name, file_type=None, smooth=False, **options):
+    """
+    Save a PL or smooth image of the diagram of a LinkManager without
+    using a canvas, so that no display is needed.  The file type is
+    one of 'pdf', 'eps', 'svg' or 'tikz', taken from the extension of
+    the file name by default.  Other options, such as width, are passed
+    to the save_as method for the file type.
+    """
+    if file_type is None:
+        file_type = file_name.rsplit('.', 1)[-1].lower()
+        if file_type == 'tex':
+            file_type = 'tikz'
+    target = manager
+    if smooth:
+        target = Smoother(None)
+        target.set_polylines(manager.polylines())
+    getattr(target, 'save_as_' + file_type)(file_name, **options)
+
+
 def save_as_eps(canvas, file_name, colormode='color', width=312.0):
     """
     The colormode must be 'color', 'gray', or 'mono'; default is 'color'.
     The width option sets the width of the figure in points.  The
     default width is 312pt = 4.33in = 11cm .
     """
-    ulx, uly, lrx, lry = canvas.bbox(Tk_.ALL)
+    ulx, uly, lrx, lry = canvas.bbox('all')
     canvas.postscript(file=file_name, x=ulx, y=uly, width=lrx-ulx, height=lry-uly,
                                colormode=colormode, pagewidth=width)
 
@@ -312,7 +479,80 @@ def save_as_svg(canvas, file_name, colormode='color', width=None):
     """
     Width is ignored for SVG images; colormode is currently ignored.
     """
-    canvasvg.saveall(file_name, canvas, items=canvas.find_withtag(Tk_.ALL))
+    # canvasvg imports tkinter, so it is only loaded when needed.
+    from . import canvasvg
+    canvasvg.saveall(file_name, canvas, items=canvas.find_withtag('all'))
+
+
+def bounds(points):
+    """
+    Return the bounding box (x0, y0, x1, y1) of some (x, y) points,
+    or (0, 0, 0, 0) if there are none.
+    """
+    x0 = y0 = float('inf')
+    x1 = y1 = float('-inf')
+    for x, y in points:
+        x0, y0 = min(x0, x), min(y0, y)
+        x1, y1 = max(x1, x), max(y1, y)
+    if x0 > x1:
+        return 0, 0, 0, 0
+    return x0, y0, x1, y1
+
+
+class SVGPicture:
+    """
+    Writes an SVG image to a file as the paths are added.  The image is
+    drawn in canvas coordinates, so no transformation is needed, and
+    the bounding box must be known in advance.  The line width is in
+    canvas units at a scale factor of 1.
+    """
+    scale_factor = 1
+
+    @classmethod
+    def set_scale(cls, factor):
+        cls.scale_factor = factor
+
+    def __init__(self, file_name, bbox, width=None, line_width=4):
+        self.file = open(file_name, 'w')
+        line_width = line_width * self.scale_factor
+        ulx, uly, lrx, lry = bbox
+        # Leave room for the round caps at the ends of the curves.
+        ulx, uly, lrx, lry = (ulx - line_width, uly - line_width,
+                              lrx + line_width, lry + line_width)
+        w, h = lrx - ulx, lry - uly
+        if width is None:
+            width = w
+        height = h*width/w
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+            'width="%.2f" height="%.2f" viewBox="%.2f %.2f %.2f %.2f">\n'
+            '<g fill="none" stroke-width="%.1f" stroke-linecap="round" '
+            'stroke-linejoin="round">\n' % (
+                width, height, ulx, uly, w, h, line_width))
+
+    def polyline(self, points, color):
+        """
+        Add a path through a list of points.
+        """
+        d = 'M %.2f %.2f' % tuple(points[0]) + ''.join(
+            ' L %.2f %.2f' % tuple(xy) for xy in points[1:])
+        self.file.write('<path stroke="%s" d="%s"/>\n' % (color, d))
+
+    def bezier(self, path, color):
+        """
+        Add a Bezier spline given in the format returned by
+        SmoothArc.bezier.
+        """
+        d = ['M %.2f %.2f' % tuple(path[0])]
+        for i in range(1, len(path) - 1, 3):
+            d.append(' C %.2f %.2f %.2f %.2f %.2f %.2f' % (
+                tuple(path[i]) + tuple(path[i+1]) + tuple(path[i+2])))
+        self.file.write('<path stroke="%s" d="%s"/>\n' % (color, ''.join(d)))
+
+    def save(self):
+        self.file.write('</g>\n</svg>\n')
+        self.file.close()
 
 
 class PDFPicture:
@@ -322,9 +562,16 @@ class PDFPicture:
     def set_scale(cls, factor):
         cls.scale_factor = factor
     
-    def __init__(self, canvas, width):
-        ulx, uly, lrx, lry = canvas.bbox(Tk_.ALL)
-        scale = float(width)/(lrx - ulx)
+    def __init__(self, canvas, width, bbox=None):
+        """
+        The bounding box is taken from the canvas unless it is given,
+        in which case the canvas may be None.
+        """
+        if bbox is None:
+            bbox = canvas.bbox('all')
+        ulx, uly, lrx, lry = bbox
+        scale = float(width)/((lrx - ulx) or 1)
+        load_pyx()
         pyx.unit.set(uscale=scale, wscale=scale, defaultunit='pt')
         self.transform = lambda xy: (xy[0]-ulx,-xy[1]+lry)
         self.canvas = pyx.canvas.canvas()
@@ -334,43 +581,110 @@ class PDFPicture:
                  pyx.style.linecap.round,
                  pyx.style.linejoin.round]
 
-    def save(self, file_name):
+    def line_style(self, color):
+        if color.startswith('#'):
+            pyx_color = pyx.color.rgbfromhexstring(color)
+        else:
+            pyx_color = getattr(pyx.color.rgb, color, pyx.color.rgb.black)
+        return self.base_line_style() + [pyx_color]
+
+    def polyline(self, points, color):
+        """
+        Stroke a path through a list of points.
+        """
+        XY = [self.transform(xy) for xy in points]
+        parts = [pyx.path.moveto(*XY[0])] + [pyx.path.lineto(*xy) for xy in XY[1:]]
+        self.canvas.stroke(pyx.path.path(*parts), self.line_style(color))
+
+    def bezier(self, path, color):
+        """
+        Stroke a Bezier spline given in the format returned by
+        SmoothArc.bezier.
+        """
+        XY = [self.transform(xy) for xy in path]
+        parts = [pyx.path.moveto(*XY[0])]
+        for i in range(1, len(XY) - 1, 3):
+            parts.append(pyx.path.curveto(*(XY[i] + XY[i+1] + XY[i+2])))
+        self.canvas.stroke(pyx.path.path(*parts), self.line_style(color))
+
+    def save(self, file_name, file_type='pdf'):
+        """
+        Write the picture as a PDF file, or as an EPS file if the
+        file_type is 'eps'.
+        """
         page = pyx.document.page(self.canvas,  bboxenlarge=3.5 * pyx.unit.t_pt)
         doc = pyx.document.document([page])
-        doc.writePDFfile(file_name)
+        if file_type == 'eps':
+            doc.writeEPSfile(file_name)
+        else:
+            doc.writePDFfile(file_name)
 
 
 class TikZPicture:
+    """
+    Writes a TikZ picture as the paths are added, grouping consecutive
+    paths of the same color into one scope.  The output may be a file
+    name or an open text stream; if it is None the picture is kept in
+    memory until it is saved.
+    """
     scale_factor = 1
 
     @classmethod
     def set_scale(cls, factor):
         cls.scale_factor = factor
 
-    def __init__(self, canvas, raw_colors, width=282.0):
-        self.string = ''
-        ulx, uly, lrx, lry = canvas.bbox(Tk_.ALL)
-        pt_scale = float(width)/(lrx - ulx)
+    def __init__(self, canvas, raw_colors, width=282.0, bbox=None,
+                 output=None):
+        """
+        The bounding box is taken from the canvas unless it is given,
+        in which case the canvas may be None.
+        """
+        self.close_file = isinstance(output, str)
+        self.buffered = output is None
+        if self.buffered:
+            self.file = io.StringIO()
+        elif self.close_file:
+            self.file = open(output, 'w')
+        else:
+            self.file = output
+        if bbox is None:
+            bbox = canvas.bbox('all')
+        ulx, uly, lrx, lry = bbox
+        pt_scale = float(width)/((lrx - ulx) or 1)
         cm_scale = 0.0352777778*pt_scale
         self.transform = lambda xy: (cm_scale*(-ulx+xy[0]), cm_scale*(lry-xy[1]))
         self.colors = dict()
+        write = self.file.write
         for i, hex_color in enumerate(raw_colors):
             self.colors[hex_color] = i
+            if not hex_color.startswith('#'):
+                # A named color, such as the default black.
+                write('\\colorlet{linkcolor%d}{%s}\n' % (i, hex_color))
+                continue
             rgb = [int(c,16)/255.0 for c in in_twos(hex_color[1:])]
-            self.string += '\\definecolor{linkcolor%d}' % i + '{rgb}{%.2f, %.2f, %.2f}\n' % tuple(rgb)
-        self.string += '\\begin{tikzpicture}[line width=%.1f, line cap=round, line join=round]\n' % (
-            pt_scale * 4 * self.scale_factor)
+            write('\\definecolor{linkcolor%d}' % i + '{rgb}{%.2f, %.2f, %.2f}\n' % tuple(rgb))
+        write('\\begin{tikzpicture}[line width=%.1f, line cap=round, line join=round]\n' % (
+            pt_scale * 4 * self.scale_factor))
         self.curcolor = None
 
     def write(self, color, line):
         if color != self.curcolor:
             if self.curcolor is not None:
-                self.string += '  \\end{scope}\n'
-            self.string += '  \\begin{scope}[color=linkcolor%d]\n' % self.colors[color]
+                self.file.write('  \\end{scope}\n')
+            self.file.write('  \\begin{scope}[color=linkcolor%d]\n' % self.colors[color])
             self.curcolor = color
-        self.string += line
+        self.file.write(line)
 
-    def save(self, file_name):
-        file = open(file_name, 'w')
-        file.write(self.string + '  \\end{scope}\n\\end{tikzpicture}\n')
-        file.close()
+    def save(self, file_name=None):
+        """
+        Finish the picture.  If it was kept in memory it is written to
+        the named file.
+        """
+        if self.curcolor is not None:
+            self.file.write('  \\end{scope}\n')
+        self.file.write('\\end{tikzpicture}\n')
+        if self.buffered and file_name is not None:
+            with open(file_name, 'w') as file:
+                file.write(self.file.getvalue())
+        if self.close_file:
+            self.file.close()
@@ -0,0 +1,124 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module exports the class SpatialGrid, a uniform grid which is
+used to find the vertices, arrows and crossings of a link diagram
+which lie near a point or an arrow without examining all of them.
+"""
+
+from math import floor
+
+
+class SpatialGrid:
+    """
+    A uniform grid of square cells covering the plane.  Each item is
+    filed under every cell which meets it: a point under a single
+    cell and a segment under the cells along its length.  Cells are
+    dicts, used as ordered sets, so queries are deterministic.
+
+    Positions are stored relative to an origin, so translating all of
+    the items only requires moving the origin.
+    """
+    cell_size = 64.0
+
+    def __init__(self, cell_size=None):
+        if cell_size is not None:
+            self.cell_size = cell_size
+        self.clear()
+
+    def __len__(self):
+        return len(self.filed)
+
+    def __contains__(self, item):
+        return item in self.filed
+
+    def clear(self):
+        self.cells = {}
+        self.filed = {}
+        self.origin = (0.0, 0.0)
+
+    def translate(self, dx, dy):
+        """
+        Move every filed item by (dx, dy).
+        """
+        x, y = self.origin
+        self.origin = (x + dx, y + dy)
+
+    def _cells(self, x0, y0, x1, y1, pad=0.0):
+        """
+        Return the cells which meet the segment from (x0, y0) to
+        (x1, y1) after it has been thickened by pad in each direction.
+        """
+        ox, oy = self.origin
+        size = self.cell_size
+        x0, y0, x1, y1 = x0 - ox, y0 - oy, x1 - ox, y1 - oy
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        result = []
+        for i in range(floor((x0 - pad)/size), floor((x1 + pad)/size) + 1):
+            if x0 == x1:
+                ya, yb = y0, y1
+            else:
+                # The part of the segment lying within pad of column i.
+                slope = (y1 - y0)/(x1 - x0)
+                a = min(max(i*size - pad, x0), x1)
+                b = min(max((i + 1)*size + pad, x0), x1)
+                ya, yb = y0 + (a - x0)*slope, y0 + (b - x0)*slope
+            bottom, top = min(ya, yb) - pad, max(ya, yb) + pad
+            for j in range(floor(bottom/size), floor(top/size) + 1):
+                result.append((i, j))
+        return result
+
+    def insert(self, item, x0, y0, x1=None, y1=None):
+        """
+        File the item under the cells meeting the point (x0, y0), or
+        the segment from (x0, y0) to (x1, y1).  An item which has
+        already been filed is moved.
+        """
+        if item in self.filed:
+            self.remove(item)
+        if x1 is None:
+            x1, y1 = x0, y0
+        cells = self._cells(x0, y0, x1, y1)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[item] = None
+        self.filed[item] = cells
+
+    def remove(self, item):
+        """
+        Remove the item from the grid, if it has been filed.
+        """
+        for cell in self.filed.pop(item, ()):
+            bucket = self.cells[cell]
+            del bucket[item]
+            if not bucket:
+                del self.cells[cell]
+
+    def find(self, x0, y0, x1=None, y1=None, pad=0.0):
+        """
+        Return a list of the items filed under the cells which meet the
+        point (x0, y0), or the segment from (x0, y0) to (x1, y1),
+        thickened by pad.  This includes every item within distance pad
+        of the point or segment, along with some other nearby items.
+        """
+        if x1 is None:
+            x1, y1 = x0, y0
+        found = {}
+        cells = self.cells
+        for cell in self._cells(x0, y0, x1, y1, pad):
+            bucket = cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return list(found)
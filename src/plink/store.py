@@ -0,0 +1,125 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module exports the class DiagramStore, which holds the geometry
+and combinatorics of a link diagram in flat arrays: the coordinates of
+the vertices, the (start, end) vertex indices of the arrows, and the
+(under, over) arrow indices and virtual flags of the crossings.
+
+A store is an export and sharing format, not the backing store of a
+LinkManager: it is a copy of the diagram, and changing it does not
+change the diagram, which can be rebuilt from it with
+LinkManager.unpickle(*store.unpickle_data()).  A store can be packed
+into a single buffer and rebuilt over any buffer without copying, e.g.
+the buf of a multiprocessing.shared_memory block, so a diagram can be
+handed to worker processes cheaply.
+"""
+
+from array import array
+
+
+class DiagramStore:
+    """
+    A link diagram stored as arrays.  The coordinates are a flat array
+    of doubles x0, y0, x1, y1, ...; the arrows and crossings are flat
+    arrays of 64 bit indices, and the virtual flags are bytes.
+    """
+    def __init__(self, coords, arrows, crossings, virtual):
+        self.coords = coords
+        self.arrows = arrows
+        self.crossings = crossings
+        self.virtual = virtual
+
+    @classmethod
+    def from_manager(cls, manager):
+        """
+        Builds a store from the diagram of a LinkManager.
+        """
+        V, A, _ = manager.index_maps()
+        coords = array('d', [t for v in manager.Vertices for t in (v.x, v.y)])
+        arrows = array('q', [V[id(v)] for a in manager.Arrows
+                             for v in (a.start, a.end)])
+        crossings = array('q', [A[id(a)] for c in manager.Crossings
+                                for a in (c.under, c.over)])
+        virtual = array('B', [c.is_virtual for c in manager.Crossings])
+        return cls(coords, arrows, crossings, virtual)
+
+    @property
+    def num_vertices(self):
+        return len(self.coords) // 2
+
+    def unpickle_data(self):
+        """
+        Returns the vertices, arrows and crossings in the form accepted
+        by LinkManager.unpickle.  Crossing labels are not stored.
+        """
+        coords, arrows, crossings = self.coords, self.arrows, self.crossings
+        return (list(zip(coords[0::2], coords[1::2])),
+                list(zip(arrows[0::2], arrows[1::2])),
+                [(u, o, bool(v), None) for u, o, v in
+                 zip(crossings[0::2], crossings[1::2], self.virtual)])
+
+    def bbox(self):
+        """
+        Returns the bounding box (x0, y0, x1, y1) of the vertices.
+        Raises ValueError if there are none.
+        """
+        if not self.coords:
+            raise ValueError('The diagram has no vertices.')
+        xs, ys = self.coords[0::2], self.coords[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def nbytes(self):
+        """
+        Returns the size of the buffer needed by pack_into.
+        """
+        size = 24 + 8*(len(self.coords) + len(self.arrows) + len(self.crossings))
+        return size + len(self.virtual)
+
+    def pack_into(self, buffer):
+        """
+        Copies the store into a writable buffer of at least nbytes()
+        bytes, such as the buf of a shared memory block.
+        """
+        view = memoryview(buffer).cast('B')
+        counts = array('q', [len(self.coords) // 2, len(self.arrows) // 2,
+                             len(self.crossings) // 2])
+        offset = 0
+        for data in (counts, self.coords, self.arrows, self.crossings,
+                     self.virtual):
+            raw = memoryview(data).cast('B')
+            view[offset:offset + len(raw)] = raw
+            offset += len(raw)
+
+    def tobytes(self):
+        buffer = bytearray(self.nbytes())
+        self.pack_into(buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """
+        Returns a store whose arrays are views of a buffer written by
+        pack_into, so no data is copied.  The buffer must stay alive.
+        """
+        view = memoryview(buffer).cast('B')
+        nv, na, nc = view[:24].cast('q')
+        sections = []
+        offset = 24
+        for code, count in (('d', 2*nv), ('q', 2*na), ('q', 2*nc), ('B', nc)):
+            size = count if code == 'B' else 8*count
+            sections.append(view[offset:offset + size].cast(code))
+            offset += size
+        return cls(*sections)
@@ -0,0 +1,171 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module exports the function find_crossings, which finds all
+pairs of crossing arrows in a PL link diagram with a Bentley-Ottmann
+sweep.  For n arrows with k crossings this makes O((n + k) log n)
+comparisons of arrows, instead of the n^2/2 tests needed to compare
+every pair.
+
+The sweep line moves from left to right; points are ordered
+lexicographically, so a vertical arrow is swept from bottom to top.
+The status is a python list of the arrows which meet the sweep line,
+ordered from bottom to top.  It is searched by bisection, but each
+insertion or deletion moves the entries above it, so in the worst
+case the sweep takes O(n(n + k)) steps.  Those moves are block copies
+of pointers, which are far cheaper than the arrow comparisons, so for
+diagrams of any practical size the comparisons dominate.  Whether two
+arrows cross, and where, is always decided by Arrow.__xor__, so the
+result agrees with comparing the arrows pairwise.
+"""
+
+from heapq import heapify, heappush, heappop
+
+
+class _Segment:
+    """
+    An arrow as seen by the sweep line, oriented from its first
+    endpoint to its last one.
+    """
+    __slots__ = ('arrow', 'index', 'x0', 'y0', 'x1', 'y1', 'slope')
+
+    def __init__(self, arrow, index):
+        self.arrow, self.index = arrow, index
+        (x0, y0), (x1, y1) = sorted([arrow.start.point(), arrow.end.point()])
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        if x0 == x1:
+            self.slope = float('inf')
+        else:
+            self.slope = (y1 - y0)/(x1 - x0)
+
+    def y_at(self, x, y):
+        """
+        The height at which this segment meets the sweep line when the
+        sweep line is at the point (x, y).  A vertical segment meets
+        the sweep line at the sweep point itself.
+        """
+        if self.x0 == self.x1:
+            return min(max(y, self.y0), self.y1)
+        return self.y0 + (x - self.x0)*self.slope
+
+
+def find_crossings(arrows):
+    """
+    Return a list of triples (a, b, t), one for each pair of arrows
+    a, b in the given list which cross, where t = a ^ b is the
+    barycentric coordinate of the crossing on a.  The arrow a comes
+    before b in the list, and the triples are sorted by the position
+    of b and then by the position of a.  The arrows must have been
+    vectorized.
+    """
+    starts, ends = {}, {}
+    size = 1.0
+    for n, arrow in enumerate(arrows):
+        if arrow.start is arrow.end or arrow.length == 0:
+            continue
+        segment = _Segment(arrow, n)
+        starts.setdefault((segment.x0, segment.y0), []).append(segment)
+        ends.setdefault((segment.x1, segment.y1), []).append(segment)
+        size = max(size, abs(segment.x0), abs(segment.y0),
+                   abs(segment.x1), abs(segment.y1))
+    # Segments within this distance of an event point pass through it.
+    eps = 1.0e-9*size
+    queue = list(set(starts) | set(ends))
+    heapify(queue)
+    # Maps scheduled crossing points to the segments which cross there.
+    through = {}
+    status = []
+    found = {}
+
+    def check(S, T, event):
+        """
+        Record the crossing of S and T, if there is one, and schedule
+        it as an event if the sweep line has not yet reached it.
+        """
+        if S.index > T.index:
+            S, T = T, S
+        arrow = S.arrow
+        t = arrow ^ T.arrow
+        if t is None:
+            return
+        found[(S.index, T.index)] = t
+        if T.arrow.dx == 0 and T.arrow ^ arrow is not None:
+            # Locate the crossing on the vertical arrow, so that it
+            # lies exactly on the sweep line which contains that arrow.
+            arrow, t = T.arrow, T.arrow ^ arrow
+        point = (arrow.start.x + t*arrow.dx, arrow.start.y + t*arrow.dy)
+        if point < event and point[0] >= event[0] - eps:
+            # Round-off put the crossing behind the sweep line.
+            point = (event[0], point[1])
+        if point > event:
+            if point not in through:
+                through[point] = set()
+                heappush(queue, point)
+            through[point].update((S, T))
+
+    while queue:
+        event = heappop(queue)
+        x, y = event
+        starting = starts.pop(event, [])
+        ending = ends.pop(event, [])
+        crossing = through.pop(event, ())
+        # Find the segments in the status which pass through the event.
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi)//2
+            if status[mid].y_at(x, y) < y - eps:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and status[hi].y_at(x, y) <= y + eps:
+            hi += 1
+        # Round-off can leave a segment which must be removed here
+        # outside of that range, so widen the range to include it.
+        nearby = set(status[lo:hi])
+        for segment in ending + list(crossing):
+            if segment not in nearby:
+                try:
+                    n = status.index(segment)
+                except ValueError:
+                    continue
+                lo, hi = min(lo, n), max(hi, n + 1)
+        removed = status[lo:hi]
+        del status[lo:hi]
+        passing = [S for S in removed if S not in ending]
+        # Any two segments which pass through the event cross there.
+        # Arrows which end at the event do not cross, unless round-off
+        # in Arrow.__xor__ says otherwise.
+        meeting = passing + starting + ending
+        for n, S in enumerate(meeting):
+            for T in meeting[n+1:]:
+                check(S, T, event)
+        # Reinsert the passing segments, followed by the new ones,
+        # in their order just beyond the event.
+        def height(S):
+            h = S.y_at(x, y)
+            return (y if abs(h - y) <= eps else h, S.slope)
+        block = sorted(passing + starting, key=height)
+        status[lo:lo] = block
+        end = lo + len(block)
+        if block:
+            if lo > 0:
+                check(status[lo - 1], status[lo], event)
+            if end < len(status):
+                check(status[end - 1], status[end], event)
+        elif 0 < lo < len(status):
+            check(status[lo - 1], status[lo], event)
+    pairs = sorted(found, key=lambda pair: (pair[1], pair[0]))
+    return [(arrows[i], arrows[j], found[(i, j)]) for i, j in pairs]
@@ -0,0 +1,218 @@
+#
+#   Copyright (C) 2007-present Marc Culler, Nathan Dunfield and others.
+#
+#   This program is distributed under the terms of the
+#   GNU General Public License, version 2 or later, as published by
+#   the Free Software Foundation.  See the file gpl-2.0.txt for details.
+#   The URL for this program is
+#     http://www.math.uic.edu/~t3m/plink
+#   A copy of the license file may be found at:
+#     http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+#   The development of this program was partially supported by
+#   the National Science Foundation under grants DMS0608567,
+#   DMS0504975 and DMS0204142.
+"""
+This module generates PL link diagrams of any size, for testing and
+benchmarking.  Each function returns a tuple (vertices, arrows,
+crossings, hot) of the form accepted by LinkManager.unpickle, e.g.
+
+    manager = LinkManager()
+    manager.unpickle(*torus_link(3, 1000))
+
+The generators are:
+
+  * braid_closure(strands, word): the closure of a braid word, with
+    one crossing per letter;
+  * torus_link(p, q): the (p, q) torus link, with (p - 1)|q| crossings;
+  * random_braid(strands, crossings): the closure of a random word;
+  * grid_diagram(X, O) and random_grid(size, components): grid
+    diagrams, with 2 size vertices and up to size^2 / 4 crossings;
+  * random_polygons(components, vertices): random polygons, whose
+    crossings are found from the geometry.
+
+Braid closures are the best choice for large diagrams, since their
+size in vertices and crossings grows linearly with the word.  The
+number of crossings of a random grid or polygon grows quadratically.
+"""
+
+import random
+from math import pi, cos, sin
+
+def braid_closure(strands, word, spacing=30.0, height=None):
+    """
+    Returns the closure of a braid on the given number of strands.
+    The word is a sequence of nonzero integers, where i stands for the
+    generator sigma_i, which crosses the strands in positions i and
+    i + 1 (numbered from 1), and -i for its inverse.  For sigma_i the
+    strand moving from position i to position i + 1 crosses over.
+    The strands run down the page and are closed up on the right.
+    """
+    if strands < 1:
+        raise ValueError('A braid needs at least one strand.')
+    height = spacing if height is None else height
+    X = [spacing*(p + 1) for p in range(strands)]
+    bottom = height*max(len(word), 1)
+    # The path of each strand, numbered by its starting position, and
+    # the strand in each position.
+    paths = [[(X[p], 0.0)] for p in range(strands)]
+    at = list(range(strands))
+    # Each crossing is recorded as (strand, segment) for the under
+    # and over arcs.
+    crossings = []
+    for level, letter in enumerate(word):
+        i = abs(letter) - 1
+        if not 0 <= i < strands - 1:
+            raise ValueError('The generator %d is out of range.' % letter)
+        y0, y1 = level*height, (level + 1)*height
+        left, right = at[i], at[i + 1]
+        for strand, x0, x1 in ((left, X[i], X[i + 1]),
+                               (right, X[i + 1], X[i])):
+            path = paths[strand]
+            if path[-1] != (x0, y0):
+                path.append((x0, y0))
+            path.append((x1, y1))
+        under, over = (right, left) if letter > 0 else (left, right)
+        crossings.append(((under, len(paths[under]) - 2),
+                          (over, len(paths[over]) - 2)))
+        at[i], at[i + 1] = right, left
+    # Close up the strands with nested loops on the right.
+    for p, strand in enumerate(at):
+        path, offset = paths[strand], spacing*(strands - p)
+        if path[-1] != (X[p], bottom):
+            path.append((X[p], bottom))
+        path += [(X[p], bottom + offset), (X[-1] + offset, bottom + offset),
+                 (X[-1] + offset, -offset), (X[p], -offset)]
+    # The loop at the end of each strand leads to the strand which
+    # starts at its final position.
+    following = [None]*strands
+    for p, strand in enumerate(at):
+        following[strand] = p
+    vertices, arrows, first = [], [], [None]*strands
+    for start in range(strands):
+        if first[start] is not None:
+            continue
+        base, strand = len(vertices), start
+        while first[strand] is None:
+            first[strand] = len(vertices)
+            vertices += paths[strand]
+            strand = following[strand]
+        arrows += [(n, n + 1) for n in range(base, len(vertices) - 1)]
+        arrows.append((len(vertices) - 1, base))
+    return (vertices, arrows,
+            [(first[u] + i, first[o] + j, False, None)
+             for (u, i), (o, j) in crossings], None)
+
+def torus_link(p, q, spacing=30.0):
+    """
+    Returns the (p, q) torus link, as the closure of the braid
+    (sigma_1 ... sigma_{p-1})^q on p strands.  It has gcd(p, q)
+    components and (p - 1)|q| crossings.
+    """
+    sign = 1 if q >= 0 else -1
+    return braid_closure(p, [sign*i for i in range(1, p)]*abs(q), spacing)
+
+def random_braid(strands, crossings, seed=None, spacing=30.0):
+    """
+    Returns the closure of a random braid word with the given number
+    of letters, i.e. crossings.
+    """
+    rng = random.Random(seed)
+    word = [rng.choice((-1, 1))*rng.randrange(1, strands)
+            for n in range(crossings)]
+    return braid_closure(strands, word, spacing)
+
+def grid_diagram(X, O, spacing=20.0):
+    """
+    Returns the link given by a grid diagram, where X[c] and O[c] are
+    the rows of the two markings in column c.  The rows of the X's and
+    of the O's must each be a permutation of range(len(X)), and X[c]
+    and O[c] must differ.  The link runs from X to O in each column
+    and from O to X in each row, and the columns cross over the rows.
+    """
+    size = len(X)
+    if sorted(X) != list(range(size)) or sorted(O) != list(range(size)):
+        raise ValueError('The markings must be permutations of the rows.')
+    column_of_X, column_of_O = [None]*size, [None]*size
+    for c in range(size):
+        column_of_X[X[c]], column_of_O[O[c]] = c, c
+    vertices, arrows, vertical = [], [], [None]*size
+    horizontal = [None]*size
+    for start in range(size):
+        if vertical[start] is not None:
+            continue
+        base, c = len(vertices), start
+        while vertical[c] is None:
+            if X[c] == O[c]:
+                raise ValueError('Column %d has two markings in one row.' % c)
+            vertical[c], horizontal[O[c]] = len(vertices), len(vertices) + 1
+            vertices += [(spacing*(c + 1), spacing*(X[c] + 1)),
+                         (spacing*(c + 1), spacing*(O[c] + 1))]
+            c = column_of_X[O[c]]
+        arrows += [(n, n + 1) for n in range(base, len(vertices) - 1)]
+        arrows.append((len(vertices) - 1, base))
+    crossings = []
+    for c in range(size):
+        low, high = sorted((X[c], O[c]))
+        for r in range(low + 1, high):
+            left, right = sorted((column_of_O[r], column_of_X[r]))
+            if left < c < right:
+                crossings.append((horizontal[r], vertical[c], False, None))
+    return vertices, arrows, crossings, None
+
+def random_grid(size, components=1, seed=None, spacing=20.0):
+    """
+    Returns a random grid diagram with size columns, whose link has
+    the given number of components.  The size must be at least twice
+    the number of components.
+    """
+    if size < 2*components:
+        raise ValueError('A grid with %d components needs at least %d '
+                         'columns.' % (components, 2*components))
+    rng = random.Random(seed)
+    # The components correspond to the cycles of the permutation which
+    # takes each column to the next column along the link.
+    lengths = [2]*components
+    for n in range(size - 2*components):
+        lengths[rng.randrange(components)] += 1
+    columns = list(range(size))
+    rng.shuffle(columns)
+    following = [None]*size
+    start = 0
+    for length in lengths:
+        cycle = columns[start:start + length]
+        for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+            following[a] = b
+        start += length
+    X = list(range(size))
+    rng.shuffle(X)
+    return grid_diagram(X, [X[following[c]] for c in range(size)], spacing)
+
+def random_polygons(components, vertices, size=1000.0, simple=False,
+                    seed=None):
+    """
+    Returns random polygons with the given number of vertices each,
+    in a square with the given side.  The vertices of an ordinary
+    polygon are uniformly distributed, so the number of crossings
+    grows quadratically.  A simple polygon is star shaped, so it has
+    no crossings with itself.  The crossings are left to be computed
+    from the geometry.
+    """
+    if vertices < 3:
+        raise ValueError('A polygon needs at least three vertices.')
+    rng = random.Random(seed)
+    points, arrows = [], []
+    for n in range(components):
+        base = len(points)
+        if simple:
+            x0, y0 = rng.uniform(0.25, 0.75)*size, rng.uniform(0.25, 0.75)*size
+            angles = sorted(rng.uniform(0, 2*pi) for m in range(vertices))
+            for angle in angles:
+                radius = rng.uniform(0.05, 0.25)*size
+                points.append((x0 + radius*cos(angle), y0 + radius*sin(angle)))
+        else:
+            points += [(rng.uniform(0, size), rng.uniform(0, size))
+                       for m in range(vertices)]
+        arrows += [(base + m, base + (m + 1) % vertices)
+                   for m in range(vertices)]
+    return points, arrows, None, None
@@ -22,6 +22,8 @@ class Vertex:
     """
     A vertex in a PL link diagram.
     """
+    __slots__ = ('x', 'y', 'in_arrow', 'out_arrow', 'canvas', 'color',
+                 'delta', 'dot', 'style')
     epsilon = 8
     scale_factor = 1
     
@@ -47,11 +47,12 @@ class LinkViewer(LinkManager):
         factor = min( (W-40)/w, (H-40)/h )
         # Make sure we get an integer bbox after zooming
         xfactor, yfactor = round(factor*w)/w, round(factor*h)/h
-        self.update_crosspoints()
         # Scale the picture, fixing the upper left corner
         for vertex in self.Vertices:
             vertex.x = x0 + xfactor*(vertex.x - x0)
             vertex.y = y0 + yfactor*(vertex.y - y0)
+        self.update_crosspoints()
+        self.rebuild_index()
         # Shift into place
         self._shift( 20 - x0, 20 - y0)
         self.update_info()
@@ -65,9 +66,7 @@ class LinkViewer(LinkManager):
         return x0, y0, x1, y1
 
     def _shift(self, dx, dy):
-        for vertex in self.Vertices:
-            vertex.x += dx
-            vertex.y += dy
+        self.translate(dx, dy)
         self.canvas.move(Tk_.ALL, dx, dy)
 
     def draw(self):
@@ -103,18 +102,10 @@ class LinkViewer(LinkManager):
         smooth.save_as_eps(self.canvas, file_name, colormode)
 
     def save_as_svg(self, file_name, colormode='color'):
+        # The PL image is copied from the canvas, which shows the
+        # arrowheads, vertices and virtual crossings.
         smooth.save_as_svg(self.canvas, file_name, colormode)
 
-    def save_as_pdf(self, file_name, colormode='color', width=312.0):
-        PDF = smooth.PDFPicture(self.canvas, width)
-        for polylines, color in self.polylines(break_at_overcrossings=False):
-            style = PDF.base_line_style() + [pyx.color.rgbfromhexstring(color)]
-            for lines in polylines:
-                lines = [PDF.transform(xy) for xy in lines]
-                path_parts = [pyx.path.moveto(* lines[0])] + [pyx.path.lineto(*xy) for xy in lines]
-                PDF.canvas.stroke(pyx.path.path(*path_parts), style)
-        PDF.save(file_name)
-
     def build_save_image_menu(self, menubar, parent_menu):
         menu = self.save_image_menu = Tk_.Menu(menubar, tearoff=0)
         save = self.save_image
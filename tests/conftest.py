@@ -0,0 +1,39 @@
+"""
+Fixtures shared by the tests: the directory of sample links and
+LinkManagers loaded from it.
+"""
+
+import os
+import pytest
+from plink.manager import LinkManager
+
+sample_dir = os.path.join(os.path.dirname(__file__), os.pardir,
+                          'dev', 'sample_links')
+
+@pytest.fixture
+def samples():
+    """
+    The directory of sample link projection files.
+    """
+    return sample_dir
+
+@pytest.fixture
+def load_sample():
+    """
+    Returns a function which loads a sample link into a new LinkManager,
+    or into the manager it is given, and returns the manager.
+    """
+    def load(name, manager=None):
+        if manager is None:
+            manager = LinkManager()
+        with open(os.path.join(sample_dir, name)) as infile:
+            manager._from_string(infile.read())
+        return manager
+    return load
+
+@pytest.fixture
+def manager(load_sample):
+    """
+    A LinkManager holding the sample link with 14 crossings.
+    """
+    return load_sample('fourteen.lnk')
@@ -0,0 +1,52 @@
+"""
+Runs the plink.batch command line tool on the sample links.
+"""
+
+import os, sys, json, subprocess
+from plink.batch import main
+
+def read_records(path):
+    with open(path) as infile:
+        return [json.loads(line) for line in infile]
+
+def test_sample_links(tmp_path, samples):
+    sample_files = sorted(name for name in os.listdir(samples)
+                          if name.endswith('.lnk'))
+    output = tmp_path / 'codes.jsonl'
+    assert main(['-j', '1', '-c', 'DT,PD', '-o', str(output), samples]) == 0
+    records = read_records(output)
+    assert [os.path.basename(r['file']) for r in records] == sample_files
+    for record in records:
+        assert set(record) == {'file', 'crossings', 'DT', 'PD', 'seconds'}
+    fourteen = records[sample_files.index('fourteen.lnk')]
+    assert fourteen['crossings'] == 14 and len(fourteen['PD']) == 14
+
+def test_bad_file(tmp_path, samples):
+    bad = tmp_path / 'bad.lnk'
+    bad.write_text('% Link Projection\n1\n0 0\nfour\n')
+    output = tmp_path / 'codes.jsonl'
+    assert main(['-j', '1', '-o', str(output),
+                 os.path.join(samples, 'tri.lnk'), str(bad)]) == 1
+    good, error = read_records(output)
+    assert 'error' not in good
+    assert error['file'] == str(bad)
+    assert error['error'].startswith('ProjectionFileError: Line 4')
+    assert 'seconds' in error
+
+def test_command_line(tmp_path, samples):
+    src = os.path.join(os.path.dirname(__file__), os.pardir, 'src')
+    env = dict(os.environ, PYTHONPATH=src)
+    result = subprocess.run(
+        [sys.executable, '-m', 'plink.batch', '-j', '1', '-c', 'Gauss', '-'],
+        input=os.path.join(samples, 'tri.lnk') + '\n', env=env,
+        capture_output=True, text=True)
+    assert result.returncode == 0
+    record = json.loads(result.stdout)
+    assert record['file'].endswith('tri.lnk') and 'Gauss' in record
+    assert 'Processed 1 files with 0 errors' in result.stderr
+
+def test_unknown_cpu_count(tmp_path, monkeypatch, samples):
+    monkeypatch.setattr(os, 'cpu_count', lambda: None)
+    output = tmp_path / 'codes.jsonl'
+    assert main(['-o', str(output), os.path.join(samples, 'tri.lnk')]) == 0
+    assert len(read_records(output)) == 1
@@ -0,0 +1,72 @@
+"""
+Tests of the LinkEditor's bookkeeping, run without a display by giving
+it a canvas which only records item coordinates.
+"""
+
+import pytest
+from plink.editor import LinkEditor
+
+class Canvas:
+    def __init__(self):
+        self.items, self.options = {}, {}
+
+    def _create(self, *coords, **options):
+        item = len(self.items) + 1
+        self.items[item] = list(coords)
+        self.options[item] = options
+        return item
+
+    create_line = create_oval = create_text = _create
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item] = list(coords)
+        return self.items[item]
+
+    def delete(self, *items):
+        pass
+
+    def itemconfig(self, *args, **options):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+@pytest.fixture
+def editor(load_sample):
+    result = LinkEditor.__new__(LinkEditor)
+    result.initialize(Canvas())
+    result.set_style = result.full_redraw = lambda: None
+    load_sample('fourteen.lnk', result)
+    for item in result.Arrows + result.Vertices:
+        item.canvas = result.canvas
+    return result
+
+def test_destroy_arrow_with_crossings(editor):
+    arrow = next(a for a in editor.Arrows if editor.crossings_on(a))
+    start = arrow.start
+    editor.destroy_arrow(arrow)
+    assert arrow not in editor.Arrows
+    for crossing in editor.Crossings:
+        assert arrow not in (crossing.over, crossing.under)
+    # Moving a vertex relocates the remaining crossings.
+    start.x += 3
+    editor.vertex_moved(start)
+    editor.relocate_crossings()
+    editor.update_crosspoints()
+    assert all(crossing.x is not None for crossing in editor.Crossings)
+
+def test_DT_labels_are_memoized(editor, monkeypatch):
+    editor.show_DT()
+    texts = [editor.canvas.options[item]['text'] for item in editor.DTlabels]
+    assert texts[:2] == [str(editor.Crossings[0].hit1),
+                         str(editor.Crossings[0].hit2) +
+                         (' *' if editor.Crossings[0].flipped else '')]
+    calls = []
+    monkeypatch.setattr(editor, 'sorted_components',
+                        lambda: calls.append(1))
+    editor.DTlabels = []
+    editor.show_DT()
+    assert calls == []
+    assert [editor.canvas.options[item]['text']
+            for item in editor.DTlabels] == texts
@@ -0,0 +1,21 @@
+"""
+Checks that "import plink" does not load tkinter, PyX, NumPy or the
+GUI modules, which are only imported when they are first needed.  The
+time taken by the import is checked by dev/import_time_test.py.
+"""
+
+import os, sys, subprocess
+
+forbidden = ['tkinter', 'pyx', 'numpy', 'plink.gui', 'plink.canvasvg',
+             'plink.viewer', 'plink.editor']
+
+def test_lazy_imports():
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       os.pardir, 'src')
+    env = dict(os.environ, PYTHONPATH=os.path.normpath(src))
+    loaded = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, plink; print(" ".join(sys.modules))'],
+        env=env, capture_output=True, text=True, check=True)
+    loaded = set(loaded.stdout.split())
+    assert [name for name in forbidden if name in loaded] == []
@@ -0,0 +1,53 @@
+"""
+Tests of the memoized invariants of a LinkManager.
+"""
+
+import pytest
+
+# Ways to modify the value of each invariant in place.
+mutators = {
+    'PD_code': lambda value: value.pop(),
+    'DT_code': lambda value: value[0].pop(),
+    'Gauss_code': lambda value: value.pop(),
+    'BB_framing': lambda value: value.pop(),
+    'SnapPea_KLPProjection': lambda value: value[3][0].clear(),
+}
+
+@pytest.mark.parametrize('name', sorted(mutators))
+def test_cached_values_are_copies(manager, name):
+    method = getattr(manager, name)
+    first = method()
+    expected = repr(first)
+    second = method()
+    assert second == first and second is not first
+    mutators[name](first)
+    mutators[name](second)
+    assert repr(method()) == expected
+
+def test_KLP_crossings_are_copies(manager):
+    KLP_crossings = manager.SnapPea_KLPProjection()[3]
+    KLP_crossings[0]['sign'] = None
+    manager.Crossings[1].KLP['sign'] = None
+    KLP_crossings = manager.SnapPea_KLPProjection()[3]
+    assert None not in [KLP['sign'] for KLP in KLP_crossings]
+
+def test_revision_invalidates(manager):
+    PD = manager.PD_code()
+    manager.Crossings[0].reverse()
+    manager.crossing_changed(manager.Crossings[0])
+    assert manager.PD_code() != PD
+
+def test_crossing_components_clears_marks(manager):
+    DT = manager.DT_code()
+    assert all(crossing.hit1 for crossing in manager.Crossings)
+    manager.crossing_components()
+    for crossing in manager.Crossings:
+        assert crossing.hit1 == crossing.hit2 == 0
+        assert crossing.flipped is None
+    # The cached DT code does not need the hit counters ...
+    assert manager.DT_code() == DT
+    # ... which sorted_components sets again.
+    manager.sorted_components()
+    evens = {abs(n) for component in DT[0] for n in component}
+    for crossing in manager.Crossings:
+        assert {abs(crossing.hit1), abs(crossing.hit2)} & evens
@@ -0,0 +1,113 @@
+"""
+Tests of plink.projection_file.read_projection, on each kind of input
+it accepts and on invalid files.
+"""
+
+import io, mmap
+import pytest
+from plink.projection_file import read_projection, ProjectionFileError
+
+tri = """\
+% Link Projection
+2
+   0    0
+   3    4
+
+5
+   32    90
+  460    87
+   29   320
+   73     9
+   66   462
+4
+   0    1
+   1    2
+   2    0
+   3    4
+2
+   3    0
+   3    1
+-1
+"""
+
+expected = ([(32.0, 90.0), (460.0, 87.0), (29.0, 320.0), (73.0, 9.0),
+             (66.0, 462.0)],
+            [(0, 1), (1, 2), (2, 0), (3, 4)],
+            [(3, 0, False, None), (3, 1, False, None)],
+            None)
+
+def test_string():
+    assert read_projection(tri) == expected
+
+def test_bytes():
+    assert read_projection(tri.encode()) == expected
+    assert read_projection(bytearray(tri.encode())) == expected
+
+def test_streams():
+    assert read_projection(io.StringIO(tri)) == expected
+    assert read_projection(io.BytesIO(tri.encode())) == expected
+
+def test_mmap(tmp_path):
+    path = tmp_path / 'tri.lnk'
+    path.write_text(tri)
+    with open(path, 'rb') as infile:
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            assert read_projection(data) == expected
+
+def test_hot_vertex():
+    vertices, arrows, crossings, hot = read_projection(
+        tri.replace('-1\n', '2\n'))
+    assert hot == 2
+
+def test_no_crossings():
+    # A file which ends after the arrows has its crossings rebuilt.
+    text = tri.split('2\n   3    0')[0]
+    assert read_projection(text) == expected[:2] + (None, None)
+
+def test_virtual():
+    text = tri.replace('% Link', '% Virtual Link').replace(
+        '   3    0\n   3    1', 'v 3 0\nr 3 1')
+    assert read_projection(text)[2] == [(3, 0, True, None),
+                                        (3, 1, False, None)]
+
+def error(text):
+    with pytest.raises(ProjectionFileError) as info:
+        read_projection(text)
+    return info.value
+
+def test_not_a_projection():
+    for text in ('', 'junk\n', b'\x00\x01'):
+        e = error(text)
+        assert (e.line, e.column) == (1, 1)
+
+@pytest.mark.parametrize('cut, line, what', [
+    ('   0    0\n', 3, 'the components'),
+    ('5\n', 5, 'the number of vertices'),
+    ('   29   320\n', 9, 'a vertex'),
+    ('   2    0\n', 15, 'an arrow'),
+    ('   3    0\n', 18, 'a crossing')])
+def test_truncated(cut, line, what):
+    e = error(tri[:tri.index(cut)])
+    assert str(e) == 'Line %d: The file ended while reading %s.' % (line, what)
+    assert (e.line, e.column) == (line, None)
+
+def test_malformed_number():
+    e = error(tri.replace('  460    87', '  460    8x7'))
+    assert (e.line, e.column) == (8, 10)
+    assert "Expected a number but found '8x7'" in str(e)
+
+def test_malformed_count():
+    e = error(tri.replace('\n5\n', '\nfive\n'))
+    assert (e.line, e.column) == (6, 1)
+
+def test_wrong_number_of_fields():
+    e = error(tri.replace('   1    2', '   1    2    3'))
+    assert (e.line, e.column) == (14, 14)
+    assert 'Expected 2 fields for an arrow but found 3' in str(e)
+
+def test_index_out_of_range():
+    e = error(tri.replace('   3    1\n-1', '   3    7\n-1'))
+    assert (e.line, e.column) == (19, 9)
+    assert 'The index 7 is out of range' in str(e)
+    e = error(tri.replace('   3    4\n2', '   3    5\n2'))
+    assert (e.line, e.column) == (16, 9)
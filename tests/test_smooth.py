@@ -0,0 +1,74 @@
+"""
+Tests of plink.smooth, comparing the NumPy kernel of compute_beziers
+with the splines computed by each curve.
+"""
+
+import pytest
+from plink import intersect, smooth
+from plink.manager import LinkManager
+from plink.smooth import SmoothArc, SmoothLoop, TwoVector, compute_beziers
+
+def curves_of(manager, tension1=1.0, tension2=1.0):
+    curves = []
+    for polyline, color in manager.polylines():
+        for arc in polyline:
+            if arc[0] == arc[-1]:
+                curves.append(SmoothLoop(None, list(arc), color,
+                                         tension1, tension2))
+            else:
+                curves.append(SmoothArc(None, arc, color,
+                                        tension1, tension2))
+    return curves
+
+@pytest.mark.parametrize('name', ['fourteen.lnk', 'many_short_segs.lnk'])
+@pytest.mark.parametrize('tensions', [(1.0, 1.0), (0.8, 1.3)])
+def test_kernel_matches_bezier(monkeypatch, load_sample, name, tensions):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(smooth, 'numpy_cutoff', 0)
+    manager = load_sample(name)
+    expected = [curve.bezier() for curve in curves_of(manager, *tensions)]
+    curves = curves_of(manager, *tensions)
+    compute_beziers(curves)
+    for path, curve in zip(expected, curves):
+        assert len(curve._bezier) == len(path)
+        for p, q in zip(path, curve._bezier):
+            assert type(q) is TwoVector
+            assert q == pytest.approx(p, abs=1e-9)
+
+def test_without_numpy(monkeypatch, manager):
+    monkeypatch.setattr(intersect, 'have_numpy', False)
+    curves = curves_of(manager)
+    compute_beziers(curves)
+    for curve in curves:
+        assert all(type(p) is TwoVector for p in curve._bezier)
+        assert curve._bezier is curve.bezier()
+
+def test_cached_curves_are_skipped(monkeypatch, manager):
+    monkeypatch.setattr(smooth, 'numpy_cutoff', 0)
+    curves = curves_of(manager)
+    first = curves[0].bezier()
+    compute_beziers(curves)
+    assert curves[0]._bezier is first
+
+def svg_header(file_name):
+    with open(file_name) as svg:
+        return svg.read().split('<path', 1)[0]
+
+@pytest.mark.parametrize('smooth_image', [False, True])
+def test_empty_svg(tmp_path, smooth_image):
+    file_name = str(tmp_path / 'empty.svg')
+    smooth.save_image(LinkManager(), file_name, smooth=smooth_image)
+    header = svg_header(file_name)
+    assert 'inf' not in header and 'nan' not in header
+    assert 'viewBox' in header
+
+def test_svg_line_widths(tmp_path, manager):
+    PL, curves = str(tmp_path / 'PL.svg'), str(tmp_path / 'smooth.svg')
+    smooth.save_image(manager, PL)
+    smooth.save_image(manager, curves, smooth=True)
+    assert 'stroke-width="3.0"' in svg_header(PL)
+    assert 'stroke-width="4.0"' in svg_header(curves)
+
+def test_bounds():
+    assert smooth.bounds([]) == (0, 0, 0, 0)
+    assert smooth.bounds([(1, 5), (-2, 3)]) == (-2, 3, 1, 5)
@@ -0,0 +1,74 @@
+"""
+Tests of plink.store.DiagramStore: packing, rebuilding over a buffer
+and round trips through LinkManager.unpickle.
+"""
+
+import pytest
+from multiprocessing import shared_memory
+from plink.manager import LinkManager
+from plink.store import DiagramStore
+
+@pytest.fixture
+def manager(manager):
+    manager.Crossings[0].is_virtual = True
+    return manager
+
+def same(store1, store2):
+    return all(list(getattr(store1, name)) == list(getattr(store2, name))
+               for name in ('coords', 'arrows', 'crossings', 'virtual'))
+
+def test_from_manager(manager):
+    diagram = manager.diagram_store()
+    assert diagram.num_vertices == len(manager.Vertices)
+    assert len(diagram.arrows) == 2*len(manager.Arrows)
+    assert len(diagram.crossings) == 2*len(manager.Crossings)
+    assert list(diagram.virtual) == [c.is_virtual for c in manager.Crossings]
+
+def test_unpickle_round_trip(manager):
+    vertices, arrows, crossings = manager.diagram_store().unpickle_data()
+    copy = LinkManager()
+    copy.unpickle(vertices, arrows, crossings)
+    assert same(copy.diagram_store(), manager.diagram_store())
+    assert copy.PD_code() == manager.PD_code()
+
+def test_pack_and_from_buffer(manager):
+    diagram = manager.diagram_store()
+    data = diagram.tobytes()
+    assert len(data) == diagram.nbytes()
+    assert same(DiagramStore.from_buffer(data), diagram)
+    # A store over a writable buffer is a view of it.
+    buffer = bytearray(data)
+    view = DiagramStore.from_buffer(buffer)
+    view.coords[0] += 1.0
+    assert buffer != data
+    assert list(DiagramStore.from_buffer(buffer).coords) == list(view.coords)
+
+def test_shared_memory(manager):
+    diagram = manager.diagram_store()
+    block = shared_memory.SharedMemory(create=True, size=diagram.nbytes())
+    try:
+        diagram.pack_into(block.buf)
+        other = shared_memory.SharedMemory(name=block.name)
+        try:
+            view = DiagramStore.from_buffer(other.buf)
+            assert same(view, diagram)
+            del view
+        finally:
+            other.close()
+    finally:
+        block.close()
+        block.unlink()
+
+def test_bbox(manager):
+    xs = [vertex.x for vertex in manager.Vertices]
+    ys = [vertex.y for vertex in manager.Vertices]
+    assert manager.diagram_store().bbox() == (min(xs), min(ys),
+                                              max(xs), max(ys))
+    with pytest.raises(ValueError, match='no vertices'):
+        LinkManager().diagram_store().bbox()
+
+def test_empty():
+    diagram = LinkManager().diagram_store()
+    copy = DiagramStore.from_buffer(diagram.tobytes())
+    assert copy.num_vertices == 0
+    assert copy.unpickle_data() == ([], [], [])
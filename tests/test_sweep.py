@@ -0,0 +1,42 @@
+"""
+Compares the sweep line of plink.sweep with testing every pair of
+arrows, on random polygons with vertices on a small integer grid,
+which have many shared vertices, collinear arrows and vertical arrows.
+"""
+
+import random
+import pytest
+from plink.vertex import Vertex
+from plink.arrow import Arrow
+from plink.sweep import find_crossings
+
+def grid_polygons(seed, components=3, vertices=12, size=8):
+    rng = random.Random(seed)
+    arrows = []
+    for n in range(components):
+        points = [Vertex(rng.randrange(size), rng.randrange(size))
+                  for m in range(vertices)]
+        arrows += [Arrow(points[m], points[(m + 1) % vertices])
+                   for m in range(vertices)]
+    for arrow in arrows:
+        arrow.vectorize()
+    return arrows
+
+def pairwise_crossings(arrows):
+    result = []
+    for j, b in enumerate(arrows):
+        for a in arrows[:j]:
+            if a.length == 0 or b.length == 0:
+                continue
+            t = a ^ b
+            if t is not None:
+                result.append((a, b, t))
+    return result
+
+@pytest.mark.parametrize('seed', range(60))
+def test_degenerate_grid_polygons(seed):
+    arrows = grid_polygons(seed)
+    assert find_crossings(arrows) == pairwise_crossings(arrows)
+
+def test_no_arrows():
+    assert find_crossings([]) == []